@@ -1,18 +1,99 @@
 """Philips Hue Sync Box integration."""
 
-from homeassistant.helpers import config_validation
+from homeassistant.core import callback
+from homeassistant.helpers import aiohttp_client
 import voluptuous
 
+from . import api
 from . import const
+from . import coordinator
+from . import entity
+from . import metrics
 from. import services
+from . import state_store
+from . import token_store
 
 
-PLATFORM_SCHEMA = config_validation.PLATFORM_SCHEMA.extend({
-    voluptuous.Required(const.CONF_IP_ADDRESS): config_validation.string,
-    voluptuous.Optional(const.CONF_NAME): config_validation.string,
-})
+CONFIG_SCHEMA = voluptuous.Schema({
+    voluptuous.Optional(const.DOMAIN): voluptuous.Schema({
+        voluptuous.Optional(
+            const.CONF_MAX_PARALLEL_CALLS,
+            default=const.DEFAULT_MAX_PARALLEL_CALLS):
+                voluptuous.All(
+                    voluptuous.Coerce(int), voluptuous.Range(min=1)),
+    }),
+}, extra=voluptuous.ALLOW_EXTRA)
 
 
 async def async_setup(hass, config):
   hass.data[const.DOMAIN] = {}
+  hass.data[const.DATA_CONFIG] = config.get(const.DOMAIN) or {}
+  hass.data[const.DATA_COORDINATORS] = {}
+  hass.data[const.DATA_SESSION] = aiohttp_client.async_create_clientsession(
+      hass, verify_ssl=False, trace_configs=[metrics.create_trace_config()])
+
+  access_tokens = token_store.TokenStore(hass)
+  await access_tokens.async_load()
+  hass.data[const.DATA_TOKEN_STORE] = access_tokens
+
+  services.register_services(hass)
+  return True
+
+
+async def async_setup_entry(hass, config_entry):
+  """Sets up a Philips Hue Sync Box from a config entry."""
+  config = {**config_entry.data, **config_entry.options}
+  sync_box_api = api.AsyncHueSyncBoxApi(
+      hass.data[const.DATA_SESSION],
+      config.get(const.CONF_IP_ADDRESS),
+      pool_size=config.get(const.CONF_POOL_SIZE, const.DEFAULT_POOL_SIZE),
+      connect_timeout=config.get(
+          const.CONF_CONNECT_TIMEOUT, const.DEFAULT_CONNECT_TIMEOUT),
+      read_timeout=config.get(
+          const.CONF_READ_TIMEOUT, const.DEFAULT_READ_TIMEOUT),
+      coalesce_window=config.get(
+          const.CONF_COALESCE_WINDOW, const.DEFAULT_COALESCE_WINDOW),
+      cache_ttl=config.get(const.CONF_CACHE_TTL, const.DEFAULT_CACHE_TTL),
+      trace_sample_rate=config.get(
+          const.CONF_TRACE_SAMPLE_RATE, const.DEFAULT_TRACE_SAMPLE_RATE),
+      trace_body_limit=config.get(
+          const.CONF_TRACE_BODY_LIMIT, const.DEFAULT_TRACE_BODY_LIMIT))
+  sync_box_coordinator = coordinator.HueSyncBoxCoordinator(
+      hass, sync_box_api,
+      config.get(const.CONF_NAME, const.DEVICE_DEFAULT_NAME),
+      state_store=state_store.SyncBoxStateStore(hass, config_entry.entry_id))
+  await sync_box_coordinator.async_restore()
+  hass.data[const.DATA_COORDINATORS][config_entry.entry_id] = (
+      sync_box_coordinator)
+
+  await hass.config_entries.async_forward_entry_setups(
+      config_entry, const.PLATFORMS)
+
+  @callback
+  def async_update_device_info():
+    """Keeps the device registry up to date with the Sync Box."""
+    if sync_box_coordinator.sync_box_state is not None:
+      entity.async_update_device_info(
+          hass, config_entry, sync_box_coordinator.sync_box_state)
+
+  async_update_device_info()
+  config_entry.async_on_unload(
+      sync_box_coordinator.async_add_listener(async_update_device_info))
   return True
+
+
+async def async_unload_entry(hass, config_entry):
+  """Unloads a Philips Hue Sync Box config entry."""
+  unloaded = await hass.config_entries.async_unload_platforms(
+      config_entry, const.PLATFORMS)
+  if unloaded:
+    sync_box_coordinator = hass.data[const.DATA_COORDINATORS].pop(
+        config_entry.entry_id)
+    await sync_box_coordinator.async_shutdown()
+  return unloaded
+
+
+async def async_remove_entry(hass, config_entry):
+  """Removes the persisted state of a removed Philips Hue Sync Box."""
+  await state_store.SyncBoxStateStore(
+      hass, config_entry.entry_id).async_remove()
@@ -0,0 +1,145 @@
+"""Admission control of the requests made to a Sync Box."""
+
+import asyncio
+import collections
+import contextlib
+import time
+
+from . import metrics
+
+# Priority lanes, from highest to lowest priority.
+LANE_INTERACTIVE = 'interactive'
+LANE_BACKGROUND = 'background'
+LANES = (LANE_INTERACTIVE, LANE_BACKGROUND)
+
+
+class AdmissionController(object):
+  """Limits the requests sent to a Sync Box, serving user commands first.
+
+  Requests are admitted while fewer than max_concurrent are in flight and a
+  token is left in a bucket refilled at rate tokens per second, holding at
+  most burst tokens. Waiting requests are admitted lane by lane: interactive
+  requests always go before background ones, and each lane is served in
+  arrival order.
+
+  Public Methods:
+    as_dict: Returns the queue metrics as a dictionary.
+    async_admit: Waits until a request may be sent.
+  """
+
+  def __init__(self, max_concurrent, rate, burst):
+    """Initializes the controller with a full bucket.
+
+    Args:
+      max_concurrent: Maximum number of requests in flight.
+      rate: Tokens added to the bucket per second.
+      burst: Maximum number of tokens in the bucket.
+    """
+    self._max_concurrent = max_concurrent
+    self._rate = rate
+    self._burst = burst
+    self._tokens = burst
+    self._refilled_at = time.monotonic()
+    self._in_flight = 0
+    self._lanes = {lane: collections.deque() for lane in LANES}
+    self._lane_metrics = {lane: metrics.LaneMetrics() for lane in LANES}
+    self._wake_up = None
+
+  @contextlib.asynccontextmanager
+  async def async_admit(self, lane):
+    """Waits until a request may be sent, and holds its slot while in flight.
+
+    Args:
+      lane: Priority lane of the request, one of LANES.
+    """
+    await self._async_acquire(lane)
+    try:
+      yield
+    finally:
+      self._release()
+
+  def as_dict(self):
+    """Returns the queue metrics as a JSON serializable dictionary."""
+    return {
+        'in_flight': self._in_flight,
+        'tokens': round(self._tokens, 2),
+        'lanes': {
+            lane: self._lane_metrics[lane].as_dict(len(self._lanes[lane]))
+            for lane in LANES
+        },
+    }
+
+  # Helpers.
+  async def _async_acquire(self, lane):
+    """Waits for a slot and a token, queueing behind higher priority lanes.
+
+    Args:
+      lane: Priority lane of the request.
+    """
+    lane_metrics = self._lane_metrics[lane]
+    if not any(self._lanes.values()) and self._try_take():
+      lane_metrics.record(0)
+      return
+
+    start = time.monotonic()
+    waiter = asyncio.get_running_loop().create_future()
+    self._lanes[lane].append(waiter)
+    lane_metrics.record_depth(len(self._lanes[lane]))
+    self._dispatch()
+    try:
+      await waiter
+    except asyncio.CancelledError:
+      if waiter.done() and not waiter.cancelled():
+        self._release()
+      raise
+    lane_metrics.record(time.monotonic() - start)
+
+  def _try_take(self):
+    """Takes a slot and a token, if both are available.
+
+    Returns:
+      Whether the request may be sent.
+    """
+    now = time.monotonic()
+    self._tokens = min(
+        self._burst, self._tokens + (now - self._refilled_at) * self._rate)
+    self._refilled_at = now
+    if self._in_flight >= self._max_concurrent or self._tokens < 1:
+      return False
+    self._tokens -= 1
+    self._in_flight += 1
+    return True
+
+  def _dispatch(self):
+    """Admits waiting requests in priority order while capacity allows."""
+    for lane in LANES:
+      waiters = self._lanes[lane]
+      while waiters:
+        if waiters[0].done():
+          waiters.popleft()  # Cancelled while waiting.
+          continue
+        if not self._try_take():
+          self._schedule_wake_up()
+          return
+        waiters.popleft().set_result(None)
+
+  def _schedule_wake_up(self):
+    """Dispatches again once a token is available.
+
+    If the limit is the number of requests in flight instead, the next
+    release dispatches again.
+    """
+    if self._wake_up is not None or self._tokens >= 1:
+      return
+    self._wake_up = asyncio.get_running_loop().call_later(
+        (1 - self._tokens) / self._rate, self._on_wake_up)
+
+  def _on_wake_up(self):
+    """Dispatches waiting requests after the bucket was refilled."""
+    self._wake_up = None
+    self._dispatch()
+
+  def _release(self):
+    """Frees the slot of a completed request."""
+    self._in_flight -= 1
+    self._dispatch()
@@ -3,61 +3,460 @@
 API Documentation: https://developers.meethue.com/develop/hue-entertainment/hue-hdmi-sync-box-api/
 """
 
+import asyncio
 import enum
-import json
+import functools
 import logging
-import requests
+import random
+import time
 
-from requests.packages.urllib3.exceptions import InsecureRequestWarning
+import aiohttp
+
+from . import admission
+from . import codec
 from . import const
+from . import metrics
+from . import resilience
+from . import throttle
 
 
 _LOGGER = logging.getLogger(__name__)
-requests.packages.urllib3.disable_warnings(InsecureRequestWarning)
+_TRACE_LOGGER = logging.getLogger(f'{__name__}.trace')
+
+# Traced in place of bodies containing credentials.
+_REDACTED_BODY = '**REDACTED**'
 
 
 class SyncBoxEndpoints(enum.Enum):
   """Philips Hue Sync Box API endpoints."""
   REGISTRATIONS = 'api/v1/registrations'
   DEVICE_DETAILS = 'api/v1'
+  BEHAVIOR = 'api/v1/behavior'
+  DEVICE = 'api/v1/device'
   EXECUTION = 'api/v1/execution'
+  HDMI = 'api/v1/hdmi'
+  HUE = 'api/v1/hue'
+
+
+# Device details sections and the endpoints serving them.
+SECTION_ENDPOINTS = {
+    'behavior': SyncBoxEndpoints.BEHAVIOR,
+    'device': SyncBoxEndpoints.DEVICE,
+    'execution': SyncBoxEndpoints.EXECUTION,
+    'hdmi': SyncBoxEndpoints.HDMI,
+    'hue': SyncBoxEndpoints.HUE,
+}
+
+# Slow-changing device details sections.
+_STATIC_SECTIONS = ('behavior', 'device', 'hdmi', 'hue')
+
+
+# Payload builders.
+def build_brightness_payload(brightness):
+  """Builds the execution payload to set brightness.
+
+  Args:
+    brightness: Brightness of the light during sync.
+
+  Returns:
+    Execution payload.
+  """
+  brightness = int(brightness)
+  if not 0 <= brightness <= 200:
+    raise ValueError(
+        'Invalid Brightness {}. Expected integer between 0-200.'.format(
+            brightness))
+  return {'brightness': brightness}
+
+
+def build_hdmi_input_payload(hdmi_input):
+  """Builds the execution payload to set the HDMI input.
+
+  Args:
+    hdmi_input: HDMI input number.
+
+  Returns:
+    Execution payload.
+  """
+  hdmi_input = str(hdmi_input).lower()
+  if hdmi_input not in const.INPUT_VALUES:
+    raise ValueError('Invalid HDMI input {}. Expected: {}.'.format(
+        hdmi_input, const.INPUT_VALUES))
+  return {'hdmiSource': f'input{hdmi_input}'}
+
+
+def build_intensity_payload(intensity, sync_mode):
+  """Builds the execution payload to set the intensity of a sync mode.
+
+  Args:
+    intensity: Intensity level.
+    sync_mode: Mode of which to set up intensity.
+
+  Returns:
+    Execution payload.
+  """
+  sync_mode = str(sync_mode).lower()
+  if sync_mode not in const.ACTIVE_SYNC_MODES:
+    raise ValueError(
+        f'Sync mode {sync_mode} does not support intensity. '
+        'Change mode first to one that supports intensity: '
+        f'{const.ACTIVE_SYNC_MODES}.')
+
+  intensity = str(intensity).lower()
+  if intensity == 'extreme':
+    intensity = 'intense'
+  if intensity not in const.INTENSITY_VALUES:
+    raise ValueError('Invalid Intensity {}. Expected: {}.'.format(
+        intensity, const.INTENSITY_VALUES))
+  return {sync_mode: {'intensity': intensity}}
+
+
+def build_sync_mode_payload(sync_mode):
+  """Builds the execution payload to set the sync mode.
+
+  Args:
+    sync_mode: Sync mode to which to set up Sync box.
+
+  Returns:
+    Execution payload.
+  """
+  sync_mode = str(sync_mode).lower()
+  if sync_mode not in const.SYNC_MODE_VALUES:
+    raise ValueError('Invalid Sync Mode {}. Expected: {}.'.format(
+        sync_mode, const.SYNC_MODE_VALUES))
+  return {'mode': sync_mode}
+
+
+def build_target_area_group_payload(group_id):
+  """Builds the execution payload to set the entertainment area.
+
+  Args:
+    group_id: Entertainment group id.
+
+  Returns:
+    Execution payload.
+  """
+  return {'hueTarget': f'{group_id}'}
+
 
+def merge_execution_payloads(payload, update):
+  """Deep-merges two execution payloads.
+
+  Values from update take precedence over those already in payload.
+
+  Args:
+    payload: Execution payload to merge into.
+    update: Execution payload to merge.
+
+  Returns:
+    New merged execution payload.
+  """
+  merged = dict(payload)
+  for key, value in update.items():
+    if isinstance(value, dict) and isinstance(merged.get(key), dict):
+      merged[key] = merge_execution_payloads(merged[key], value)
+    else:
+      merged[key] = value
+  return merged
+
+
+def get_execution_payload_scope(payload):
+  """Gets the device details sections an execution payload changes.
+
+  Args:
+    payload: Execution payload accepted by the Sync Box.
+
+  Returns:
+    Tuple of device details section names.
+  """
+  scope = []
+  if any(key != 'hueTarget' for key in payload):
+    scope.append('execution')
+  if 'hueTarget' in payload:
+    scope.append('hue')
+  return tuple(scope)
+
+
+def apply_execution_payload(device_details, payload):
+  """Applies an accepted execution payload to the known device details.
+
+  Used to compute the state the Sync Box will be in after an execution
+  request succeeds, without having to fetch the device details again.
+
+  Args:
+    device_details: Dictionary containing device information.
+    payload: Execution payload accepted by the Sync Box.
+
+  Returns:
+    New device details dictionary. The given one is left untouched.
+  """
+  device_details = dict(device_details)
+  execution = dict(device_details.get('execution', {}))
+
+  for key, value in payload.items():
+    if isinstance(value, dict):
+      execution[key] = {**execution.get(key, {}), **value}
+    else:
+      execution[key] = value
+
+  sync_mode = payload.get('mode')
+  if sync_mode is not None:
+    execution['syncActive'] = sync_mode in const.ACTIVE_SYNC_MODES
+    execution['hdmiActive'] = sync_mode != 'powersave'
+
+  hue_target = payload.get('hueTarget')
+  if hue_target is not None:
+    device_details['hue'] = {
+        **device_details.get('hue', {}), 'groupId': hue_target}
+
+  device_details['execution'] = execution
+  return device_details
+
+
+def _truncate_body(body, limit):
+  """Truncates a request or response body for tracing.
+
+  Args:
+    body: Body as bytes or str. May be None.
+    limit: Maximum number of bytes to keep.
+
+  Returns:
+    Body as text, marked with its full size if truncated.
+  """
+  if not body:
+    return None
+  if isinstance(body, str):
+    body = body.encode('utf-8')
+  if len(body) <= limit:
+    return body.decode('utf-8', errors='replace')
+  return '{}... ({} bytes)'.format(
+      body[:limit].decode('utf-8', errors='replace'), len(body))
 
-class HueSyncBoxApi(object):
-  """Class to interact with Philips Hye Sync Box API.
+
+def _get_registration_payload(instance_name):
+  """Gets the payload to register a new application on the Sync Box.
+
+  Args:
+    instance_name: Name of the instance for which to generate token.
+
+  Returns:
+    Registration payload.
+  """
+  return {
+      'appName': 'hass',
+      'instanceName': instance_name,
+  }
+
+
+def _get_access_token_from_registration(response_json):
+  """Extracts the access token from a registration response.
+
+  Args:
+    response_json: Decoded registration response.
+
+  Returns:
+    Access token. None if not found.
+  """
+  if response_json.get('code') is not None:
+    error_code = response_json.get('code')
+    error_message = response_json.get('message')
+    _LOGGER.debug(
+        'Unable to retrieve access token. Error %s: %s.',
+        error_code, error_message)
+    return None
+
+  access_token = response_json.get('accessToken')
+  if access_token:
+    _LOGGER.debug('Access token found from API.')
+  return access_token
+
+
+class _HueSyncBoxApiBase(object):
+  """Shared helpers for the Philips Hue Sync Box API client."""
+
+  def __init__(self, ip_address, access_token=None):
+    """Initializes API service.
+
+    Args:
+      ip_address: IP of the Sync Box.
+      access_token: Access token to interact with API.
+    """
+    self._ip_address = ip_address
+    self._access_token = access_token
+
+  @property
+  def has_access_token(self):
+    """Returns whether an access token has been set."""
+    return bool(self._access_token)
+
+  def set_access_token(self, access_token):
+    """Sets internal access token.
+
+    Args:
+      access_token: Access token to interact with API.
+    """
+    self._access_token = access_token
+
+  def _get_authorization_headers(self):
+    """Gets the authorization headers to make API requests.
+
+    Returns:
+      Authorization headers to make API request.
+    """
+    if not self._access_token:
+      raise ValueError('Access token has not been enabled.')
+    return {'Authorization': 'Bearer ' + self._access_token}
+
+  def _get_api_url(self, api_endpoint):
+    """Gets URL for a given endpoint and JSON payload.
+
+    Args:
+      api_endpoint: SyncBoxEndpoints to call.
+
+    Returns:
+      API URL.
+    """
+    return 'https://{ip}/{endpoint}'.format(
+        ip=self._ip_address,
+        endpoint=api_endpoint.value,
+    )
+
+
+class AsyncHueSyncBoxApi(_HueSyncBoxApiBase):
+  """Class to interact with Philips Hue Sync Box API from the event loop.
+
+  Requests are sent through a shared aiohttp session, so no thread is held
+  while waiting on the network. Execution payloads received within the
+  coalesce window are merged and sent to the box as a single request, and
+  superseded brightness and intensity changes are dropped while a previous one
+  is in flight.
+
+  Device details are fetched conditionally. If the Sync Box sends ETags, the
+  full document is only downloaded again when it changed. Otherwise, only the
+  execution section is fetched on every refresh, and the slow-changing
+  behavior, device, HDMI and Hue sections are refreshed on a much longer
+  cadence. Callers may also fetch only the sections they need.
+
+  Requests that fail with timeouts, connection or server errors are retried
+  with jittered backoff if they are idempotent. All requests go through a
+  circuit breaker, so they fail fast while the box is unreachable.
+
+  Requests are rate limited per box, and commands are sent ahead of the
+  device details requests waiting to be sent.
+
+  Attributes:
+    admission: AdmissionController of the requests made to the box.
+    circuit_breaker: CircuitBreaker of the requests made to the box.
+    metrics: SyncBoxMetrics recorded for the requests made to the box.
 
   Public Methods:
-    get_device_details: Gets device details.
+    get_device_details: Gets device details, or some of its sections.
     request_access_token: Requests access token from API.
     set_access_token: Sets access token after requesting it.
     set_brightness: Sets brightness of the lights during sync.
+    set_execution: Sends an execution payload.
     set_hdmi_input: Sets HDMI input.
     set_intensity: Sets intensity of the sync.
     set_sync_mode: Sets the Sync mode.
+    set_target_area_group: Sets the entertainment area.
   """
 
-  def __init__(self, ip_address, access_token=None):
+  def __init__(
+          self, session, ip_address, access_token=None,
+          pool_size=const.DEFAULT_POOL_SIZE,
+          connect_timeout=const.DEFAULT_CONNECT_TIMEOUT,
+          read_timeout=const.DEFAULT_READ_TIMEOUT,
+          coalesce_window=const.DEFAULT_COALESCE_WINDOW,
+          cache_ttl=const.DEFAULT_CACHE_TTL,
+          trace_sample_rate=const.DEFAULT_TRACE_SAMPLE_RATE,
+          trace_body_limit=const.DEFAULT_TRACE_BODY_LIMIT):
     """Initializes API service.
 
     Args:
+      session: Shared aiohttp.ClientSession used to make requests.
       ip_address: IP of the Sync Box.
       access_token: Access token to interact with API.
+      pool_size: Maximum number of requests in flight to the box.
+      connect_timeout: Seconds to wait for the connection to be established.
+      read_timeout: Seconds to wait for the box to send a response.
+      coalesce_window: Seconds during which execution payloads are merged
+        into a single request.
+      cache_ttl: Seconds during which fetched device details are reused.
+      trace_sample_rate: Fraction (0-1) of requests logged as structured
+        traces, including their bodies. 0 disables tracing.
+      trace_body_limit: Maximum bytes of each body included in a trace.
     """
-    self._ip_address = ip_address
-    self._access_token = access_token
-    _LOGGER.debug(f'Philips Hue Sync Box API for IP {ip_address} initialized.')
+    super().__init__(ip_address, access_token)
+    self._session = session
+    self.admission = admission.AdmissionController(
+        pool_size, const.REQUEST_RATE, const.REQUEST_BURST)
+    self.metrics = metrics.SyncBoxMetrics()
+    self.circuit_breaker = resilience.CircuitBreaker(
+        ip_address, const.BREAKER_FAILURE_THRESHOLD,
+        const.BREAKER_RESET_TIMEOUT)
+    self._trace_sample_rate = trace_sample_rate
+    self._trace_body_limit = trace_body_limit
+    self._timeout = aiohttp.ClientTimeout(
+        connect=connect_timeout, sock_read=read_timeout)
+
+    # Execution coalescing.
+    self._coalesce_window = coalesce_window
+    self._pending_execution = None
+    self._pending_waiters = []
+    self._execution_tasks = set()
+    self._throttle = throttle.LatestWinsThrottle(self._coalesce_execution)
+
+    # Device details single-flight and cache.
+    self._cache_ttl = cache_ttl
+    self._device_details = None
+    self._device_details_time = 0
+    self._device_details_requests = {}
+    self._device_details_generation = 0
+
+    # Conditional requests.
+    self._etags = {}
+    self._etag_responses = {}
+    self._use_sections = None
+    self._last_device_details = None
+    self._section_times = {}
+    _LOGGER.debug(
+        'Philips Hue Sync Box async API for IP %s initialized.', ip_address)
 
   # Public methods.
-  def get_device_details(self):
+  async def get_device_details(self, scope=None):
     """Gets device details.
 
+    Concurrent callers share a single request, and details fetched less than
+    the cache TTL ago are returned without calling the Sync Box. The returned
+    dictionary is shared between callers and must not be modified.
+
+    Args:
+      scope: Names of the sections to fetch, e.g. ('execution',). The other
+        sections are reused from the previous device details. By default,
+        all sections are fetched if the box sends ETags. Otherwise, only the
+        execution section and the slow-changing sections not refreshed for
+        STATIC_SECTIONS_REFRESH_INTERVAL are fetched.
+
     Returns:
       Dictionary containing device information.
     """
-    response = self._call_api_endpoint(SyncBoxEndpoints.DEVICE_DETAILS)
-    return response.json()
-
-  def request_access_token(self, instance_name):
+    if (self._device_details is not None and
+        time.monotonic() - self._device_details_time < self._cache_ttl):
+      return self._device_details
+
+    if self._last_device_details is None:
+      scope = None
+    request_key = frozenset(scope) if scope is not None else None
+    request = self._device_details_requests.get(request_key)
+    if request is None:
+      request = asyncio.ensure_future(self._fetch_device_details(scope))
+      request.add_done_callback(
+          lambda unused_request: self._device_details_requests.pop(
+              request_key, None))
+      self._device_details_requests[request_key] = request
+    return await asyncio.shield(request)
+
+  async def request_access_token(self, instance_name):
     """Gets access token from API.
 
     Args:
@@ -67,153 +466,249 @@ class HueSyncBoxApi(object):
       Access token. None if not found.
     """
     _LOGGER.debug(
-        f'Requested Philips Hue Sync Box access token for {instance_name}.')
+        'Requested Philips Hue Sync Box access token for %s.', instance_name)
 
-    payload = {
-        'appName': 'hass',
-        'instanceName': instance_name,
-    }
-    response = self._call_api_endpoint(SyncBoxEndpoints.REGISTRATIONS, payload)
-    response_json = response.json()
-
-    if response_json.get('code') is not None:
-      error_code = response_json.get('code')
-      error_message = response_json.get('message')
-      _LOGGER.debug(
-          f'Unable to retrieve access token. '
-          f'Error {error_code}: {error_message}.')
-      return None
-
-    access_token = response_json.get('accessToken')
+    payload = _get_registration_payload(instance_name)
+    response_json = await self._call_api_endpoint(
+        SyncBoxEndpoints.REGISTRATIONS, payload)
+    access_token = _get_access_token_from_registration(response_json or {})
     if access_token:
-      _LOGGER.debug(f'Access token found from API.')
       self.set_access_token(access_token)
 
     return access_token
 
-  def set_access_token(self, access_token):
-    """Sets internal access token.
-
-    Args:
-      access_token: Access token to interact with API.
-    """
-    self._access_token = access_token
-
-  def set_brightness(self, brightness):
+  async def set_brightness(self, brightness):
     """Sets HDMI Sync Box to a certain brightness.
 
     Args:
       brightness: Brightness of the light during sync.
     """
-    brightness = int(brightness)
-    if not 0 <= brightness <= 200:
-      raise ValueError(
-          'Invalid Brightness {}. Expected integer between 0-200.'.format(
-              brightness))
-
-    payload = {'brightness': brightness}
-    response = self._call_api_endpoint(SyncBoxEndpoints.EXECUTION, payload)
-    _LOGGER.debug(f'Response {response.status_code}: {response.text}')
+    await self.set_execution(
+        build_brightness_payload(brightness), throttle_key='brightness')
 
-  def set_hdmi_input(self, hdmi_input):
+  async def set_hdmi_input(self, hdmi_input):
     """Sets HDMI Sync box to a certain HDMI input.
 
     Args:
       hdmi_input: HDMI input number.
     """
-    hdmi_input = str(hdmi_input).lower()
-    if hdmi_input not in const.INPUT_VALUES:
-      raise ValueError('Invalid HDMI input {}. Expected: {}.'.format(
-          hdmi_input, const.INPUT_VALUES))
-
-    payload = {'hdmiSource': f'input{hdmi_input}'}
-    response = self._call_api_endpoint(SyncBoxEndpoints.EXECUTION, payload)
-    _LOGGER.debug(f'Response {response.status_code}: {response.text}')
+    await self.set_execution(build_hdmi_input_payload(hdmi_input))
 
-  def set_target_area_group(self, group_id):
+  async def set_target_area_group(self, group_id):
     """Sets the entertainment group area target.
 
     Args:
       group_id: Entertainment group id.
     """
-    payload = {'hueTarget': f'{group_id}'}
-    response = self._call_api_endpoint(SyncBoxEndpoints.EXECUTION, payload)
-    _LOGGER.debug(f'Response {response.status_code}: {response.text}')
+    await self.set_execution(build_target_area_group_payload(group_id))
 
-  def set_intensity(self, intensity, sync_mode):
+  async def set_intensity(self, intensity, sync_mode):
     """Sets HDMI Sync Box to a certain intensity mode
 
     Args:
-      sync_mode: Mode of which to set up intensity.
       intensity: Intensity level.
+      sync_mode: Mode of which to set up intensity.
     """
-    sync_mode = str(sync_mode).lower()
-    if sync_mode not in const.ACTIVE_SYNC_MODES:
-      raise ValueError(
-          f'Sync mode {sync_mode} does not support intensity. '
-          'Change mode first to one that supports intensity: '
-          f'{const.ACTIVE_SYNC_MODES}.')
-
-    intensity = str(intensity).lower()
-    if intensity == 'extreme':
-      intensity = 'intense'
-    if intensity not in const.INTENSITY_VALUES:
-      raise ValueError('Invalid Intensity {}. Expected: {}.'.format(
-          intensity, const.INTENSITY_VALUES))
-
-    payload = {sync_mode: {'intensity': intensity}}
-    response = self._call_api_endpoint(SyncBoxEndpoints.EXECUTION, payload)
-    _LOGGER.debug(f'Response {response.status_code}: {response.text}')
-
-  def set_sync_mode(self, sync_mode):
+    await self.set_execution(
+        build_intensity_payload(intensity, sync_mode),
+        throttle_key=f'{str(sync_mode).lower()}_intensity')
+
+  async def set_sync_mode(self, sync_mode):
     """Sets HDMI Sync Box to a certain sync mode.
 
     Args:
       sync_mode: Sync mode to which to set up Sync box.
     """
-    sync_mode = str(sync_mode).lower()
-    if sync_mode not in const.SYNC_MODE_VALUES:
-      raise ValueError('Invalid Sync Mode {}. Expected: {}.'.format(
-          sync_mode, const.SYNC_MODE_VALUES))
+    await self.set_execution(build_sync_mode_payload(sync_mode))
+
+  async def set_execution(self, payload, throttle_key=None):
+    """Sends an already validated execution payload to the Sync Box.
+
+    The payload is merged with any other received within the coalesce window
+    and the call returns once the merged request completes.
+
+    Args:
+      payload: Execution payload, as built by the build_*_payload helpers.
+      throttle_key: Name of the setting the payload changes, for settings
+        that may be changed many times per second, e.g. from a slider.
+        Payloads with the same key are sent one at a time: while one is in
+        flight, only the latest payload received is kept and sent next.
 
-    payload = {'mode': sync_mode}
-    response = self._call_api_endpoint(SyncBoxEndpoints.EXECUTION, payload)
-    _LOGGER.debug(f'Response {response.status_code}: {response.text}')
+    Returns:
+      Whether the payload was sent. False if a newer payload with the same
+      throttle key superseded it.
+    """
+    if throttle_key is not None:
+      return await self._throttle.async_call(throttle_key, payload)
+    await self._coalesce_execution(payload)
+    return True
 
   # Helpers.
-  def _get_authorization_headers(self):
-    """Gets the authorization headers to make API requests.
+  async def _coalesce_execution(self, payload):
+    """Sends an execution payload, merged with others in the coalesce window.
+
+    Args:
+      payload: Execution payload.
+    """
+    loop = asyncio.get_running_loop()
+    if self._pending_execution is None:
+      self._pending_execution = {}
+      loop.call_later(self._coalesce_window, self._flush_execution)
+
+    self._pending_execution = merge_execution_payloads(
+        self._pending_execution, payload)
+    waiter = loop.create_future()
+    self._pending_waiters.append(waiter)
+    await waiter
+
+  async def _fetch_device_details(self, scope=None):
+    """Fetches the device details and caches them.
+
+    Details are not cached if an execution request was sent meanwhile, as
+    they may not reflect it.
+
+    Args:
+      scope: Names of the sections to fetch. Defaults to all sections, or
+        the stale sections if the box does not send ETags.
 
     Returns:
-      Authorization headers to make API request.
+      Dictionary containing device information.
     """
-    if not self._access_token:
-      raise ValueError('Access token has not been enabled.')
-    return {'Authorization': 'Bearer ' + self._access_token}
+    generation = self._device_details_generation
+    if scope is None and self._use_sections:
+      scope = self._get_stale_sections()
+
+    if scope is None:
+      device_details = await self._call_api_endpoint(
+          SyncBoxEndpoints.DEVICE_DETAILS)
+      if self._use_sections is None:
+        self._set_fetch_mode()
+    else:
+      device_details = await self._fetch_device_sections(scope)
+    self._last_device_details = device_details
+
+    if generation == self._device_details_generation:
+      self._device_details = device_details
+      self._device_details_time = time.monotonic()
+    return device_details
+
+  def _set_fetch_mode(self):
+    """Picks how to fetch device details after the first full fetch."""
+    self._use_sections = (
+        SyncBoxEndpoints.DEVICE_DETAILS not in self._etags)
+    if self._use_sections:
+      now = time.monotonic()
+      self._section_times = {section: now for section in _STATIC_SECTIONS}
+    _LOGGER.debug(
+        'Sync Box %s %s ETags. Fetching device details %s.',
+        self._ip_address,
+        'does not send' if self._use_sections else 'sends',
+        'by section' if self._use_sections else 'conditionally')
 
-  def _get_api_url(self, api_endpoint):
-    """Gets URL for a given endpoint and JSON payload.
+  def _get_stale_sections(self):
+    """Gets the execution section and the slow-changing sections to refresh.
+
+    Returns:
+      List of section names.
+    """
+    now = time.monotonic()
+    return ['execution'] + [
+        section for section in _STATIC_SECTIONS
+        if now - self._section_times.get(section, 0) >=
+        const.STATIC_SECTIONS_REFRESH_INTERVAL
+    ]
+
+  async def _fetch_device_sections(self, sections):
+    """Fetches some sections of the device details concurrently.
+
+    Sections not fetched are reused from the previous device details, so
+    unchanged sections keep their identity for the consumers.
 
     Args:
-      api_endpoint: SyncBoxEndpoints to call.
+      sections: Names of the sections to fetch.
 
     Returns:
-      API URL.
+      Dictionary containing device information.
     """
-    return 'https://{ip}/{endpoint}'.format(
-        ip=self._ip_address,
-        endpoint=api_endpoint.value,
-    )
+    now = time.monotonic()
+    sections = list(sections)
+    responses = await asyncio.gather(*(
+        self._call_api_endpoint(SECTION_ENDPOINTS[section])
+        for section in sections))
+
+    device_details = dict(self._last_device_details)
+    for section, response in zip(sections, responses):
+      device_details[section] = response or {}
+      self._section_times[section] = now
+
+    # The active area is part of both the execution and the Hue sections, so
+    # the one not fetched is kept consistent with the one fetched.
+    hue = device_details.get('hue', {})
+    execution = device_details.get('execution', {})
+    hue_target = execution.get('hueTarget')
+    group_id = hue.get('groupId')
+    if ('hue' not in sections and hue_target is not None and
+        group_id != hue_target):
+      device_details['hue'] = {**hue, 'groupId': hue_target}
+    elif ('execution' not in sections and group_id is not None and
+          hue_target != group_id):
+      device_details['execution'] = {**execution, 'hueTarget': group_id}
+    return device_details
+
+  def _invalidate_device_details(self):
+    """Drops the cached device details after the Sync Box state changed."""
+    self._device_details = None
+    self._device_details_generation += 1
+
+  def _flush_execution(self):
+    """Sends the execution payload merged during the coalesce window."""
+    payload = self._pending_execution
+    waiters = self._pending_waiters
+    self._pending_execution = None
+    self._pending_waiters = []
+
+    task = asyncio.ensure_future(self._send_execution(payload, waiters))
+    self._execution_tasks.add(task)
+    task.add_done_callback(self._execution_tasks.discard)
+
+  async def _send_execution(self, payload, waiters):
+    """Sends a merged execution payload and resolves its waiters.
+
+    Args:
+      payload: Merged execution payload.
+      waiters: Futures of the callers whose payloads were merged.
+    """
+    if len(waiters) > 1:
+      _LOGGER.debug(
+          'Coalesced %s execution requests for Sync Box %s.',
+          len(waiters), self._ip_address)
+    try:
+      await self._call_api_endpoint(SyncBoxEndpoints.EXECUTION, payload)
+    except Exception as error:  # pylint: disable=broad-except
+      self._invalidate_device_details()
+      for waiter in waiters:
+        if not waiter.done():
+          waiter.set_exception(error)
+    else:
+      self._invalidate_device_details()
+      for waiter in waiters:
+        if not waiter.done():
+          waiter.set_result(None)
 
-  def _call_api_endpoint(self, api_endpoint, payload=None):
-    """Makes a call to the Sync Box API endpoint.
+  async def _send_request(self, api_endpoint, payload=None):
+    """Sends the request for an endpoint through the shared session.
+
+    GET requests are conditional when the Sync Box sent an ETag for the
+    endpoint before. If it answers 304 Not Modified, the previously decoded
+    response is returned without parsing anything.
 
     Args:
-      api_endpoint: SyncBoxEndpoints to call.
+      api_endpoint: SyncBoxEndpoints to call. The execution endpoint is read
+        if no payload is given.
       payload: Payload to send to API call.
 
     Returns:
-      API response in dict format.
+      API response decoded from JSON. None if the response has no body.
     """
     api_url = self._get_api_url(api_endpoint)
     api_headers = {
@@ -221,19 +716,132 @@ class HueSyncBoxApi(object):
     }
 
     if api_endpoint == SyncBoxEndpoints.REGISTRATIONS:
-      response = requests.post(api_url, data=json.dumps(payload), verify=False)
-    elif api_endpoint == SyncBoxEndpoints.DEVICE_DETAILS:
+      method = 'POST'
+    elif api_endpoint == SyncBoxEndpoints.EXECUTION and payload is not None:
+      method = 'PUT'
       api_headers.update(self._get_authorization_headers())
-      response = requests.get(api_url, headers=api_headers, verify=False)
-    elif api_endpoint == SyncBoxEndpoints.EXECUTION:
+    else:
+      method = 'GET'
       api_headers.update(self._get_authorization_headers())
-      response = requests.put(
-          api_url, data=json.dumps(payload), headers=api_headers, verify=False)
+      if api_endpoint in self._etags:
+        api_headers['If-None-Match'] = self._etags[api_endpoint]
+
+    data = codec.dumps(payload) if payload is not None else None
+    trace = metrics.RequestTrace()
+    response_body = b''
+    response_etag = None
+    status = None
+    error = True
+    lane = (
+        admission.LANE_BACKGROUND if method == 'GET'
+        else admission.LANE_INTERACTIVE)
+    async with self.admission.async_admit(lane):
+      start = time.monotonic()
+      try:
+        async with self._session.request(
+                method, api_url, data=data, headers=api_headers, ssl=False,
+                timeout=self._timeout, trace_request_ctx=trace) as response:
+          response_body = await response.read()
+          status = response.status
+          response_etag = response.headers.get('ETag')
+          _LOGGER.debug(
+              'Made %s request to %s. Response %s (%s bytes).',
+              method, api_url, status, len(response_body))
+          error = status >= 400
+          if api_endpoint != SyncBoxEndpoints.REGISTRATIONS:
+            response.raise_for_status()
+      finally:
+        latency = time.monotonic() - start
+        self.metrics.record(
+            api_endpoint, latency, trace=trace,
+            bytes_in=len(response_body),
+            bytes_out=len(data) if data else 0, error=error)
+        if (self._trace_sample_rate and
+            _TRACE_LOGGER.isEnabledFor(logging.INFO) and
+            random.random() < self._trace_sample_rate):
+          self._trace_request(
+              api_endpoint, method, latency, data, response_body, status)
+
+    if status == 304:
+      return self._etag_responses.get(api_endpoint)
+
+    response_json = codec.loads(response_body) if response_body else None
+    if method == 'GET' and response_etag:
+      self._etags[api_endpoint] = response_etag
+      self._etag_responses[api_endpoint] = response_json
+    return response_json
+
+  def _trace_request(
+          self, api_endpoint, method, latency, request_body, response_body,
+          status):
+    """Logs a structured trace of a request.
+
+    Args:
+      api_endpoint: SyncBoxEndpoints called.
+      method: HTTP method of the request.
+      latency: Seconds the request took.
+      request_body: Body sent to the Sync Box.
+      response_body: Body received from the Sync Box.
+      status: HTTP status of the response. None if no response was received.
+    """
+    if api_endpoint == SyncBoxEndpoints.REGISTRATIONS and response_body:
+      response_body = _REDACTED_BODY  # Contains the access token.
+    _TRACE_LOGGER.info('%s', codec.dumps({
+        'ip_address': self._ip_address,
+        'endpoint': api_endpoint.name,
+        'method': method,
+        'status': status,
+        'latency_ms': round(latency * 1000, 1),
+        'request_body': _truncate_body(request_body, self._trace_body_limit),
+        'response_body': _truncate_body(
+            response_body, self._trace_body_limit),
+    }).decode('utf-8'))
+
+  async def _call_api_endpoint(self, api_endpoint, payload=None):
+    """Makes a call to the Sync Box API endpoint through the circuit breaker.
+
+    Args:
+      api_endpoint: SyncBoxEndpoints to call.
+      payload: Payload to send to API call.
+
+    Returns:
+      API response in dict format.
+
+    Raises:
+      resilience.CircuitOpenError: The Sync Box is unreachable.
+    """
+    if payload is None and api_endpoint != SyncBoxEndpoints.REGISTRATIONS:
+      call = functools.partial(
+          resilience.async_retry,
+          functools.partial(self._send_request, api_endpoint),
+          const.RETRY_COUNT, const.RETRY_BASE_DELAY)
     else:
-      raise NotImplementedError('Unknown API endpoint.')
+      call = functools.partial(
+          self._send_request_reconnecting, api_endpoint, payload)
+    return await self.circuit_breaker.async_call(call, self._probe)
 
-    _LOGGER.debug(
-        f'Made {response.request.method} request to {response.request.url} '
-        f'with body: {response.request.body}')
+  async def _send_request_reconnecting(self, api_endpoint, payload=None):
+    """Sends a request that is not safe to retry.
 
-    return response
+    If the box drops a kept-alive connection, the request is sent once more on
+    a fresh connection.
+
+    Args:
+      api_endpoint: SyncBoxEndpoints to call.
+      payload: Payload to send to API call.
+
+    Returns:
+      API response in dict format.
+    """
+    try:
+      return await self._send_request(api_endpoint, payload)
+    except (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError) as error:
+      _LOGGER.debug(
+          'Connection to Sync Box %s lost (%s). Reconnecting.',
+          self._ip_address, error)
+      return await self._send_request(api_endpoint, payload)
+
+  async def _probe(self):
+    """Sends a cheap request to check whether the Sync Box is reachable."""
+    if self.has_access_token:
+      await self._send_request(SyncBoxEndpoints.DEVICE)
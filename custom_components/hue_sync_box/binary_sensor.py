@@ -0,0 +1,48 @@
+"""Binary sensors of the HDMI and sync status of a Philips Hue Sync Box."""
+
+from homeassistant.components import binary_sensor
+
+from . import const
+from . import entity
+
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+  """Adds the binary sensors of a Philips Hue Sync Box config entry."""
+  sync_box_coordinator = hass.data[const.DATA_COORDINATORS][
+      config_entry.entry_id]
+  async_add_entities([
+      HueSyncBoxBinarySensor(
+          sync_box_coordinator, config_entry, 'hdmi_active', 'HDMI active',
+          lambda sync_box_state: sync_box_state.execution.hdmi_active),
+      HueSyncBoxBinarySensor(
+          sync_box_coordinator, config_entry, 'sync_active', 'Sync active',
+          lambda sync_box_state: sync_box_state.execution.sync_active),
+  ])
+
+
+class HueSyncBoxBinarySensor(
+        entity.HueSyncBoxEntity, binary_sensor.BinarySensorEntity):
+  """Boolean status of a Sync Box."""
+
+  def __init__(self, sync_box_coordinator, config_entry, key, name, get_value):
+    """Initializes the binary sensor.
+
+    Args:
+      sync_box_coordinator: HueSyncBoxCoordinator polling the Sync Box.
+      config_entry: Config entry of the Sync Box.
+      key: Key of the status shown.
+      name: Name of the binary sensor.
+      get_value: Function getting the status from a SyncBoxState.
+    """
+    self._get_status = get_value
+    super().__init__(sync_box_coordinator, config_entry, key, name)
+
+  @property
+  def is_on(self):
+    """Returns whether the status is active."""
+    return self._value
+
+  def _get_value(self, sync_box_state):
+    """Gets whether the status is active. None if unknown."""
+    status = self._get_status(sync_box_state)
+    return status if isinstance(status, bool) else None
@@ -0,0 +1,41 @@
+"""JSON encoding of the Sync Box API requests and responses.
+
+Uses orjson, which Home Assistant ships with, when it is installed and the
+standard library json module otherwise. Both encode to and decode from bytes,
+so bodies never go through an intermediate str.
+"""
+
+import json
+
+try:
+  import orjson
+except ImportError:
+  orjson = None
+
+
+def dumps(obj):
+  """Encodes an object as JSON.
+
+  Args:
+    obj: JSON serializable object.
+
+  Returns:
+    UTF-8 encoded JSON bytes.
+  """
+  if orjson is not None:
+    return orjson.dumps(obj)
+  return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+def loads(data):
+  """Decodes JSON straight from bytes.
+
+  Args:
+    data: UTF-8 encoded JSON bytes or str.
+
+  Returns:
+    Decoded object.
+  """
+  if orjson is not None:
+    return orjson.loads(data)
+  return json.loads(data)
@@ -0,0 +1,57 @@
+"""Config flow to set up Philips Hue Sync Boxes."""
+
+import logging
+
+from homeassistant import config_entries
+import voluptuous
+
+from . import const
+
+_LOGGER = logging.getLogger(__name__)
+
+USER_SCHEMA = voluptuous.Schema({
+    voluptuous.Required(const.CONF_IP_ADDRESS): str,
+    voluptuous.Optional(
+        const.CONF_NAME, default=const.DEVICE_DEFAULT_NAME): str,
+    voluptuous.Optional(
+        const.CONF_COMPACT_ATTRIBUTES,
+        default=const.DEFAULT_COMPACT_ATTRIBUTES): bool,
+})
+
+
+class HueSyncBoxConfigFlow(config_entries.ConfigFlow, domain=const.DOMAIN):
+  """Handles the set up of a Philips Hue Sync Box."""
+
+  VERSION = 1
+
+  async def async_step_user(self, user_input=None):
+    """Sets up a Sync Box from the user interface.
+
+    Args:
+      user_input: IP address, name and options entered by the user.
+    """
+    if user_input is None:
+      return self.async_show_form(step_id='user', data_schema=USER_SCHEMA)
+    return await self._async_create_sync_box_entry(user_input)
+
+  async def async_step_import(self, import_config):
+    """Imports a Sync Box configured as a YAML remote platform.
+
+    Args:
+      import_config: Platform configuration of the Sync Box.
+    """
+    _LOGGER.debug(
+        f'Importing Hue Sync Box {import_config.get(const.CONF_NAME)}.')
+    return await self._async_create_sync_box_entry(import_config)
+
+  async def _async_create_sync_box_entry(self, config):
+    """Creates the config entry of a Sync Box, unless it already exists.
+
+    Args:
+      config: Configuration of the Sync Box.
+    """
+    await self.async_set_unique_id(config[const.CONF_IP_ADDRESS])
+    self._abort_if_unique_id_configured(updates=dict(config))
+    return self.async_create_entry(
+        title=config.get(const.CONF_NAME, const.DEVICE_DEFAULT_NAME),
+        data=dict(config))
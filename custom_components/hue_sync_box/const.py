@@ -4,20 +4,43 @@ from homeassistant import const
 
 # Set up.
 DOMAIN = 'hue_sync_box'
-PLATFORMS = ['remote']
-TOKEN_FILE = 'hue-sync-box-token-cache-{}'
+PLATFORMS = ['binary_sensor', 'number', 'remote', 'select']
+TOKEN_FILE = 'hue-sync-box-token-cache-{}'  # Legacy, imported on start up.
+TOKEN_STORAGE_KEY = f'{DOMAIN}.tokens'
+TOKEN_STORAGE_VERSION = 1
+STATE_SAVE_DELAY = 30  # Seconds.
+STATE_STORAGE_KEY = f'{DOMAIN}.state.{{}}'
+STATE_STORAGE_VERSION = 1
+
+# Integration config.
+CONF_MAX_PARALLEL_CALLS = 'max_parallel_calls'
+DATA_CONFIG = f'{DOMAIN}_config'
+DATA_COORDINATORS = f'{DOMAIN}_coordinators'
+DATA_SESSION = f'{DOMAIN}_session'
+DATA_TOKEN_STORE = f'{DOMAIN}_token_store'
 
 # Platform config.
 CONF_ENTITY_ID = const.CONF_ENTITY_ID
 CONF_IP_ADDRESS = const.CONF_IP_ADDRESS
 CONF_NAME = const.CONF_NAME
+CONF_PLATFORM = const.CONF_PLATFORM
+CONF_CACHE_TTL = 'cache_ttl'
+CONF_COALESCE_WINDOW = 'coalesce_window'
+CONF_COMPACT_ATTRIBUTES = 'compact_attributes'
+CONF_CONNECT_TIMEOUT = 'connect_timeout'
+CONF_POOL_SIZE = 'pool_size'
+CONF_READ_TIMEOUT = 'read_timeout'
+CONF_TRACE_BODY_LIMIT = 'trace_body_limit'
+CONF_TRACE_SAMPLE_RATE = 'trace_sample_rate'
 
 # Services.
+SERVICE_DUMP_DIAGNOSTICS = 'dump_diagnostics'
 SERVICE_GET_ACCESS_TOKEN = 'get_access_token'
 SERVICE_SET_AREA = 'set_area'
 SERVICE_SET_BRIGHTNESS = 'set_brightness'
 SERVICE_SET_HDMI_INPUT = 'set_hdmi_input'
 SERVICE_SET_INTENSITY = 'set_intensity'
+SERVICE_SET_STATE = 'set_state'
 SERVICE_SET_SYNC_MODE = 'set_sync_mode'
 SERVICE_TOGGLE = const.SERVICE_TOGGLE
 SERVICE_TURN_OFF = const.SERVICE_TURN_OFF
@@ -32,9 +55,40 @@ ATTR_HDMI_INPUT = 'hdmi_input'
 ATTR_INTENSITY = 'intensity'
 ATTR_SYNC_MODE = 'sync_mode'
 
+# Events.
+EVENT_DIAGNOSTICS = f'{DOMAIN}_diagnostics'
+
 # Default values.
 DEFAULT_STR_VALUE = 'undefined'
 DEVICE_DEFAULT_NAME = 'Philips Hue Sync Box'
+DEFAULT_CACHE_TTL = 0.25  # Seconds.
+DEFAULT_COALESCE_WINDOW = 0.03  # Seconds.
+DEFAULT_COMPACT_ATTRIBUTES = False
+DEFAULT_CONNECT_TIMEOUT = 5  # Seconds.
+DEFAULT_MAX_PARALLEL_CALLS = 4
+DEFAULT_POOL_SIZE = 2
+DEFAULT_READ_TIMEOUT = 10  # Seconds.
+DEFAULT_TRACE_BODY_LIMIT = 1024  # Bytes.
+DEFAULT_TRACE_SAMPLE_RATE = 0
+RECONCILE_COOLDOWN = 2  # Seconds.
+
+# Resilience.
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_RESET_TIMEOUT = 30  # Seconds.
+RETRY_BASE_DELAY = 0.25  # Seconds.
+RETRY_COUNT = 2
+
+# Admission control.
+REQUEST_BURST = 4
+REQUEST_RATE = 8  # Requests per second.
+
+# Polling intervals.
+COMMAND_FAST_POLL_PERIOD = 60  # Seconds.
+DEFAULT_SCAN_INTERVAL = 30  # Seconds.
+FAST_SCAN_INTERVAL = 5  # Seconds.
+MAX_SCAN_INTERVAL = 300  # Seconds.
+SLOW_SCAN_INTERVAL = 120  # Seconds.
+STATIC_SECTIONS_REFRESH_INTERVAL = 600  # Seconds.
 
 # Accepted API values.
 INPUT_VALUES = ('1', '2', '3', '4')
@@ -43,3 +97,4 @@ DEFAULT_SYNC_MODE = 'passthrough'
 SYNC_MODE_VALUES = ('passthrough', 'powersave') + ACTIVE_SYNC_MODES
 INTENSITY_VALUES = (
     'subtle', 'moderate', 'high', 'extreme', 'intense')  # Extreme = Intense.
+INTENSITY_OPTIONS = ('subtle', 'moderate', 'high', 'intense')  # No aliases.
@@ -0,0 +1,216 @@
+"""Coordinates the polling of a Sync Box shared by all its consumers."""
+
+import asyncio
+import datetime
+import logging
+import time
+
+import aiohttp
+
+from homeassistant.helpers import debounce
+from homeassistant.helpers import update_coordinator
+
+from . import api
+from . import const
+from . import models
+from . import resilience
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HueSyncBoxCoordinator(update_coordinator.DataUpdateCoordinator):
+  """Owns the device details requests of one Sync Box.
+
+  Concurrent refreshes share a single in-flight get_device_details request.
+  Refreshes requested after a command, or by consumers with a scope, only
+  fetch the sections of the device details that may have changed, while
+  periodic polls leave the choice to the API client: the whole document if
+  the box sends ETags, else the execution section and any slow-changing
+  section older than its refresh interval. The polling interval adapts to
+  the state of the box: fast while syncing or right after a command, slow in
+  powersave and backing off exponentially while the box cannot be reached.
+
+  The last fetched device details are persisted, if a state store is given,
+  and restored on start up, so consumers have a state straight away and the
+  first refresh only reconciles it with the Sync Box. They are only written
+  again when a refresh changed them.
+
+  Properties:
+    sync_box_state: SyncBoxState parsed from the current device details.
+
+  Public Methods:
+    async_apply_execution: Applies an accepted execution payload.
+    async_fetch: Refreshes the device details, sharing in-flight requests.
+    async_restore: Restores persisted device details.
+  """
+
+  def __init__(self, hass, sync_box_api, name, state_store=None):
+    """Initializes the coordinator.
+
+    Args:
+      hass: Home Assistant instance.
+      sync_box_api: AsyncHueSyncBoxApi of the Sync Box.
+      name: Name of the Sync Box, used for logging.
+      state_store: SyncBoxStateStore persisting the device details.
+    """
+    super().__init__(
+        hass, _LOGGER, name=name,
+        update_interval=datetime.timedelta(
+            seconds=const.DEFAULT_SCAN_INTERVAL),
+        request_refresh_debouncer=debounce.Debouncer(
+            hass, _LOGGER, cooldown=const.RECONCILE_COOLDOWN,
+            immediate=False))
+    self.api = sync_box_api
+    self._state_store = state_store
+    self.api.circuit_breaker.add_listener(self.async_update_listeners)
+    self._failures = 0
+    self._fast_poll_until = 0
+    self._refresh_task = None
+    self._refresh_task_scope = None
+    self._pending_scopes = []
+    self._sync_box_state = None
+    self._sync_box_state_data = None
+
+  @property
+  def sync_box_state(self):
+    """Returns the SyncBoxState parsed from the current device details.
+
+    It is parsed once per change of the device details and shared by all
+    consumers. None until the device details are known.
+    """
+    if self.data is None:
+      return None
+    if self.data is not self._sync_box_state_data:
+      self._sync_box_state = models.SyncBoxState.from_device_details(
+          self.data, self._sync_box_state_data, self._sync_box_state)
+      self._sync_box_state_data = self.data
+    return self._sync_box_state
+
+  async def async_fetch(self, scope=None):
+    """Refreshes the device details, sharing any refresh already running.
+
+    Args:
+      scope: Names of the sections to refresh, e.g. ('execution',). Defaults
+        to all sections.
+    """
+    if self._refresh_task is not None and not self._covers_scope(
+            self._refresh_task_scope, scope):
+      await asyncio.shield(self._refresh_task)
+
+    if self._refresh_task is None:
+      self._pending_scopes.append(scope)
+      self._refresh_task_scope = scope
+      self._refresh_task = self.hass.async_create_task(self.async_refresh())
+      self._refresh_task.add_done_callback(self._clear_refresh_task)
+    await asyncio.shield(self._refresh_task)
+
+  async def async_restore(self):
+    """Restores the persisted device details, before the first refresh."""
+    if self._state_store is None or self.data is not None:
+      return
+    device_details = await self._state_store.async_load()
+    if device_details:
+      self.data = device_details
+
+  async def async_apply_execution(self, payload):
+    """Applies an execution payload accepted by the Sync Box.
+
+    The resulting state is shared with all listeners straight away, polling
+    switches to the fast interval and a debounced refresh reconciles the
+    state with the Sync Box.
+
+    Args:
+      payload: Execution payload accepted by the Sync Box.
+    """
+    self._fast_poll_until = time.monotonic() + const.COMMAND_FAST_POLL_PERIOD
+    self.update_interval = self._get_update_interval()
+    if self.data is not None:
+      self.async_set_updated_data(
+          api.apply_execution_payload(self.data, payload))
+    self._pending_scopes.append(api.get_execution_payload_scope(payload))
+    await self.async_request_refresh()
+
+  async def _async_update_data(self):
+    """Fetches the device details from the Sync Box.
+
+    Only the sections requested since the last refresh are fetched. If none
+    were requested, as for periodic polls, the API client fetches the default
+    scope of get_device_details.
+
+    Returns:
+      Dictionary containing device information.
+    """
+    if not self.api.has_access_token:
+      return self.data
+
+    scopes, self._pending_scopes = self._pending_scopes, []
+    scope = None
+    if scopes and None not in scopes:
+      scope = tuple(sorted(set().union(*scopes)))
+
+    try:
+      data = await self.api.get_device_details(scope=scope)
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+      if not isinstance(error, resilience.CircuitOpenError):
+        self._failures += 1  # Fast fails of an open circuit do not back off.
+      self.update_interval = self._get_update_interval()
+      raise update_coordinator.UpdateFailed(
+          f'Unable to reach Sync Box {self.name}: {error!r}') from error
+
+    self._failures = 0
+    self.update_interval = self._get_update_interval(data)
+    if self._state_store is not None and data is not self.data:
+      self._state_store.async_schedule_save(data)
+    return data
+
+  def _clear_refresh_task(self, unused_task):
+    """Forgets the finished in-flight refresh."""
+    self._refresh_task = None
+    self._refresh_task_scope = None
+
+  @staticmethod
+  def _covers_scope(refresh_scope, scope):
+    """Gets whether a refresh fetches all the sections of a scope.
+
+    Args:
+      refresh_scope: Sections fetched by the refresh. None for all sections.
+      scope: Sections needed. None for all sections.
+
+    Returns:
+      Whether the refresh fetches all the sections needed.
+    """
+    if refresh_scope is None:
+      return True
+    return scope is not None and set(scope) <= set(refresh_scope)
+
+  def _get_update_interval(self, data=None):
+    """Gets the polling interval adapted to the state of the Sync Box.
+
+    While the circuit is open, the box is polled at least once per reset
+    timeout, so the circuit breaker probes it as soon as it may.
+
+    Args:
+      data: Latest device details. Defaults to the current ones.
+
+    Returns:
+      Polling interval.
+    """
+    if data is None:
+      data = self.data or {}
+    execution = data.get('execution', {})
+
+    if self._failures:
+      seconds = min(
+          const.DEFAULT_SCAN_INTERVAL * 2 ** (self._failures - 1),
+          const.MAX_SCAN_INTERVAL)
+    elif (execution.get('syncActive') or
+          time.monotonic() < self._fast_poll_until):
+      seconds = const.FAST_SCAN_INTERVAL
+    elif execution.get('mode') == 'powersave':
+      seconds = const.SLOW_SCAN_INTERVAL
+    else:
+      seconds = const.DEFAULT_SCAN_INTERVAL
+
+    if self.api.circuit_breaker.is_open:
+      seconds = min(seconds, const.BREAKER_RESET_TIMEOUT)
+    return datetime.timedelta(seconds=seconds)
@@ -0,0 +1,51 @@
+"""Diagnostics of a Philips Hue Sync Box config entry."""
+
+import dataclasses
+
+from homeassistant.components import diagnostics
+
+from . import const
+
+# Config entry data not shared in diagnostics.
+_REDACTED_KEYS = {const.CONF_IP_ADDRESS}
+
+
+async def async_get_config_entry_diagnostics(hass, config_entry):
+  """Gets the diagnostics of a Sync Box config entry.
+
+  Includes the entertainment areas, input names and intensities, which the
+  remote can keep out of its state attributes.
+
+  Args:
+    hass: Home Assistant instance.
+    config_entry: Config entry of the Sync Box.
+
+  Returns:
+    Diagnostics dictionary.
+  """
+  sync_box_coordinator = hass.data[const.DATA_COORDINATORS][
+      config_entry.entry_id]
+  sync_box_api = sync_box_coordinator.api
+  sync_box_state = sync_box_coordinator.sync_box_state
+  return {
+      'config': diagnostics.async_redact_data(
+          {**config_entry.data, **config_entry.options}, _REDACTED_KEYS),
+      'last_update_success': sync_box_coordinator.last_update_success,
+      'circuit': sync_box_api.circuit_breaker.state,
+      'requests': sync_box_api.metrics.as_dict(),
+      'admission': sync_box_api.admission.as_dict(),
+      'device': (
+          dataclasses.asdict(sync_box_state.device)
+          if sync_box_state is not None else None),
+      'groups': [
+          dataclasses.asdict(group) for group in sync_box_state.hue.groups
+      ] if sync_box_state is not None else [],
+      'inputs': {
+          f'input{number}': input_name
+          for number, input_name in zip(
+              const.INPUT_VALUES, sync_box_state.hdmi.input_names)
+      } if sync_box_state is not None else {},
+      'intensities': (
+          sync_box_state.execution.intensities
+          if sync_box_state is not None else {}),
+  }
@@ -0,0 +1,134 @@
+"""Base class of the entities showing one value of a Sync Box."""
+
+from homeassistant.core import callback
+from homeassistant.helpers import device_registry
+from homeassistant.helpers import update_coordinator
+
+from . import const
+
+
+def get_device_info(config_entry, sync_box_state=None):
+  """Gets the device registry information of a Sync Box.
+
+  Args:
+    config_entry: Config entry of the Sync Box.
+    sync_box_state: SyncBoxState of the Sync Box, if known.
+
+  Returns:
+    Device information dictionary.
+  """
+  device_info = {
+      'identifiers': {(const.DOMAIN, config_entry.unique_id)},
+      'manufacturer': 'Philips',
+      'name': config_entry.title,
+  }
+  if sync_box_state is not None:
+    device_info['model'] = sync_box_state.device.device_type
+    device_info['sw_version'] = sync_box_state.device.firmware_version
+  return device_info
+
+
+@callback
+def async_update_device_info(hass, config_entry, sync_box_state):
+  """Updates the model and firmware of a Sync Box in the device registry.
+
+  Entities only register their device information when they are added, which
+  may be before the state of the box is known.
+
+  Args:
+    hass: Home Assistant instance.
+    config_entry: Config entry of the Sync Box.
+    sync_box_state: SyncBoxState of the Sync Box.
+  """
+  registry = device_registry.async_get(hass)
+  device = registry.async_get_device(
+      identifiers={(const.DOMAIN, config_entry.unique_id)})
+  model = sync_box_state.device.device_type
+  sw_version = sync_box_state.device.firmware_version
+  if device is not None and (
+          device.model != model or device.sw_version != sw_version):
+    registry.async_update_device(
+        device.id, model=model, sw_version=sw_version)
+
+
+class HueSyncBoxEntity(update_coordinator.CoordinatorEntity):
+  """Entity showing one value of a Sync Box, fed by its coordinator.
+
+  All the entities of a box share the SyncBoxState of a single fetch. Each of
+  them only writes its state when its own value, or its availability,
+  changes. Subclasses implement _get_value.
+  """
+
+  _attr_has_entity_name = True
+
+  def __init__(self, sync_box_coordinator, config_entry, key, name):
+    """Initializes the entity.
+
+    Args:
+      sync_box_coordinator: HueSyncBoxCoordinator polling the Sync Box.
+      config_entry: Config entry of the Sync Box.
+      key: Key of the value shown, unique among the entities of the box.
+      name: Name of the entity, shown after the name of the box.
+    """
+    super().__init__(sync_box_coordinator)
+    self._api = sync_box_coordinator.api
+    self._attr_name = name
+    self._attr_unique_id = f'{config_entry.unique_id}_{key}'
+    self._attr_device_info = get_device_info(
+        config_entry, sync_box_coordinator.sync_box_state)
+    self._last_available = None
+    self._value = None
+    self._update_value()
+
+  @property
+  def available(self):
+    """Returns whether the Sync Box can be reached and its state is known."""
+    return (
+        super().available and
+        self.coordinator.sync_box_state is not None and
+        not self._api.circuit_breaker.is_open)
+
+  def _get_value(self, sync_box_state):
+    """Gets the value shown by the entity.
+
+    Args:
+      sync_box_state: SyncBoxState of the Sync Box.
+
+    Returns:
+      Value shown by the entity. Must support equality comparison.
+    """
+    raise NotImplementedError()
+
+  @callback
+  def _handle_coordinator_update(self):
+    """Writes the state if the value or the availability changed."""
+    changed = self._update_value()
+    available = self.available
+    if changed or available != self._last_available:
+      self._last_available = available
+      self.async_write_ha_state()
+
+  def _update_value(self):
+    """Updates the value from the current SyncBoxState.
+
+    Returns:
+      Whether the value changed.
+    """
+    sync_box_state = self.coordinator.sync_box_state
+    value = (
+        self._get_value(sync_box_state) if sync_box_state is not None
+        else None)
+    if value == self._value:
+      return False
+    self._value = value
+    return True
+
+  async def _async_execute(self, payload, throttle_key=None):
+    """Sends an execution payload and applies it to the shared state.
+
+    Args:
+      payload: Execution payload to send to the Sync Box.
+      throttle_key: Name of the setting changed, to drop superseded values.
+    """
+    if await self._api.set_execution(payload, throttle_key=throttle_key):
+      await self.coordinator.async_apply_execution(payload)
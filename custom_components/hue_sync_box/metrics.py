@@ -0,0 +1,194 @@
+"""Request instrumentation for the Sync Box API clients."""
+
+import bisect
+import time
+
+import aiohttp
+
+# Upper bounds, in milliseconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class LatencyHistogram(object):
+  """Histogram of latencies with fixed millisecond buckets."""
+
+  def __init__(self):
+    """Initializes an empty histogram."""
+    self._counts = [0] * (len(LATENCY_BUCKETS) + 1)
+    self._count = 0
+    self._total = 0.0
+    self._max = 0.0
+
+  def record(self, seconds):
+    """Records a latency.
+
+    Args:
+      seconds: Latency in seconds.
+    """
+    milliseconds = seconds * 1000
+    self._counts[bisect.bisect_left(LATENCY_BUCKETS, milliseconds)] += 1
+    self._count += 1
+    self._total += milliseconds
+    self._max = max(self._max, milliseconds)
+
+  def as_dict(self):
+    """Returns the histogram as a JSON serializable dictionary."""
+    buckets = {
+        f'le_{bound}ms': count
+        for bound, count in zip(LATENCY_BUCKETS, self._counts)
+    }
+    buckets['gt_{}ms'.format(LATENCY_BUCKETS[-1])] = self._counts[-1]
+    return {
+        'count': self._count,
+        'mean_ms': round(self._total / self._count, 1) if self._count else 0,
+        'max_ms': round(self._max, 1),
+        'buckets': buckets,
+    }
+
+
+class EndpointMetrics(object):
+  """Request metrics of one Sync Box API endpoint."""
+
+  def __init__(self):
+    """Initializes empty metrics."""
+    self.requests = 0
+    self.errors = 0
+    self.bytes_in = 0
+    self.bytes_out = 0
+    self.latency = LatencyHistogram()
+    self.connect = LatencyHistogram()
+
+  def as_dict(self):
+    """Returns the metrics as a JSON serializable dictionary."""
+    return {
+        'requests': self.requests,
+        'errors': self.errors,
+        'bytes_in': self.bytes_in,
+        'bytes_out': self.bytes_out,
+        'latency': self.latency.as_dict(),
+        'connect': self.connect.as_dict(),
+    }
+
+
+class LaneMetrics(object):
+  """Queueing metrics of one admission control priority lane."""
+
+  def __init__(self):
+    """Initializes empty metrics."""
+    self.admitted = 0
+    self.max_depth = 0
+    self.wait = LatencyHistogram()
+
+  def record(self, wait):
+    """Records an admitted request.
+
+    Args:
+      wait: Seconds the request waited to be admitted.
+    """
+    self.admitted += 1
+    self.wait.record(wait)
+
+  def record_depth(self, depth):
+    """Records the number of requests waiting in the lane.
+
+    Args:
+      depth: Number of requests waiting.
+    """
+    self.max_depth = max(self.max_depth, depth)
+
+  def as_dict(self, depth):
+    """Returns the metrics as a JSON serializable dictionary.
+
+    Args:
+      depth: Number of requests currently waiting in the lane.
+    """
+    return {
+        'admitted': self.admitted,
+        'depth': depth,
+        'max_depth': self.max_depth,
+        'wait': self.wait.as_dict(),
+    }
+
+
+class RequestTrace(object):
+  """Timings of a single request, filled in by the session trace config.
+
+  Attributes:
+    connect_time: Seconds spent opening a new connection (TCP connect and TLS
+      handshake). None if a kept-alive connection was reused.
+  """
+
+  def __init__(self):
+    self.connect_time = None
+    self._connect_start = None
+
+
+class SyncBoxMetrics(object):
+  """Request metrics of one Sync Box, per API endpoint.
+
+  Public Methods:
+    as_dict: Returns the metrics as a dictionary.
+    record: Records a completed request.
+  """
+
+  def __init__(self):
+    """Initializes empty metrics."""
+    self._endpoints = {}
+
+  def record(
+          self, api_endpoint, latency, trace=None, bytes_in=0, bytes_out=0,
+          error=False):
+    """Records a completed request.
+
+    Args:
+      api_endpoint: SyncBoxEndpoints called.
+      latency: Seconds the request took.
+      trace: RequestTrace of the request.
+      bytes_in: Size of the response body.
+      bytes_out: Size of the request body.
+      error: Whether the request failed.
+    """
+    endpoint_metrics = self._endpoints.get(api_endpoint.name)
+    if endpoint_metrics is None:
+      endpoint_metrics = self._endpoints[api_endpoint.name] = EndpointMetrics()
+
+    endpoint_metrics.requests += 1
+    endpoint_metrics.bytes_in += bytes_in
+    endpoint_metrics.bytes_out += bytes_out
+    endpoint_metrics.latency.record(latency)
+    if error:
+      endpoint_metrics.errors += 1
+    if trace is not None and trace.connect_time is not None:
+      endpoint_metrics.connect.record(trace.connect_time)
+
+  def as_dict(self):
+    """Returns the metrics as a JSON serializable dictionary."""
+    return {
+        endpoint: endpoint_metrics.as_dict()
+        for endpoint, endpoint_metrics in sorted(self._endpoints.items())
+    }
+
+
+# Session tracing.
+async def _on_connection_create_start(session, trace_config_ctx, params):
+  trace = trace_config_ctx.trace_request_ctx
+  if isinstance(trace, RequestTrace):
+    trace._connect_start = time.monotonic()
+
+
+async def _on_connection_create_end(session, trace_config_ctx, params):
+  trace = trace_config_ctx.trace_request_ctx
+  if isinstance(trace, RequestTrace) and trace._connect_start is not None:
+    trace.connect_time = time.monotonic() - trace._connect_start
+
+
+def create_trace_config():
+  """Creates the aiohttp trace config filling in RequestTrace timings.
+
+  Returns:
+    aiohttp.TraceConfig to pass to the client session.
+  """
+  trace_config = aiohttp.TraceConfig()
+  trace_config.on_connection_create_start.append(_on_connection_create_start)
+  trace_config.on_connection_create_end.append(_on_connection_create_end)
+  return trace_config
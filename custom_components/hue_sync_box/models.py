@@ -0,0 +1,228 @@
+"""Compact, immutable state of a Sync Box parsed from its device details."""
+
+import dataclasses
+import typing
+
+from . import const
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Device(object):
+  """Device section of the device details."""
+
+  name: str
+  device_type: typing.Optional[str]
+  unique_id: typing.Optional[str]
+  firmware_version: typing.Optional[str]
+
+  @classmethod
+  def from_dict(cls, device):
+    """Parses the device section.
+
+    Args:
+      device: Device section of the device details.
+
+    Returns:
+      Device.
+    """
+    return cls(
+        name=device.get('name', const.DEVICE_DEFAULT_NAME),
+        device_type=device.get('deviceType'),
+        unique_id=device.get('uniqueId'),
+        firmware_version=device.get('firmwareVersion'))
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Execution(object):
+  """Execution section of the device details."""
+
+  mode: str
+  sync_active: typing.Any
+  hdmi_active: typing.Any
+  hdmi_source: typing.Any
+  hue_target: typing.Optional[str]
+  brightness: typing.Any
+  video_intensity: typing.Optional[str]
+  game_intensity: typing.Optional[str]
+  music_intensity: typing.Optional[str]
+
+  @classmethod
+  def from_dict(cls, execution):
+    """Parses the execution section.
+
+    Args:
+      execution: Execution section of the device details.
+
+    Returns:
+      Execution.
+    """
+    return cls(
+        mode=execution.get('mode', const.DEFAULT_STR_VALUE),
+        sync_active=execution.get('syncActive', const.DEFAULT_STR_VALUE),
+        hdmi_active=execution.get('hdmiActive', const.DEFAULT_STR_VALUE),
+        hdmi_source=execution.get('hdmiSource', const.DEFAULT_STR_VALUE),
+        hue_target=execution.get('hueTarget'),
+        brightness=execution.get('brightness', const.DEFAULT_STR_VALUE),
+        video_intensity=execution.get('video', {}).get('intensity'),
+        game_intensity=execution.get('game', {}).get('intensity'),
+        music_intensity=execution.get('music', {}).get('intensity'))
+
+  @property
+  def intensities(self):
+    """Returns the intensity of each sync mode."""
+    return {
+        'video': self.video_intensity,
+        'game': self.game_intensity,
+        'music': self.music_intensity,
+    }
+
+  @property
+  def intensity(self):
+    """Returns the intensity of the current sync mode. 'off' if not syncing."""
+    if self.mode not in const.ACTIVE_SYNC_MODES:
+      return 'off'
+    return getattr(self, f'{self.mode}_intensity')
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class Hdmi(object):
+  """HDMI section of the device details."""
+
+  input_names: typing.Tuple[str, ...]
+
+  @classmethod
+  def from_dict(cls, hdmi):
+    """Parses the HDMI section.
+
+    Args:
+      hdmi: HDMI section of the device details.
+
+    Returns:
+      Hdmi.
+    """
+    return cls(input_names=tuple(
+        hdmi.get(f'input{number}', {}).get('name', f'HDMI {number}')
+        for number in const.INPUT_VALUES))
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class HueGroup(object):
+  """Hue entertainment area."""
+
+  id: str
+  name: str
+  num_lights: typing.Optional[int]
+  active: typing.Optional[bool]
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class HueGroups(object):
+  """Hue section of the device details."""
+
+  groups: typing.Tuple[HueGroup, ...]
+  group_id: typing.Optional[str]
+
+  @classmethod
+  def from_dict(cls, hue, previous=None):
+    """Parses the Hue section.
+
+    Args:
+      hue: Hue section of the device details.
+      previous: HueGroups parsed from the previous Hue section. Its groups
+        are reused if they did not change.
+
+    Returns:
+      HueGroups.
+    """
+    groups = tuple(
+        HueGroup(
+            id=group_id,
+            name=group.get('name'),
+            num_lights=group.get('numLights'),
+            active=group.get('active'))
+        for group_id, group in hue.get('groups', {}).items())
+    if previous is not None and previous.groups == groups:
+      groups = previous.groups
+    return cls(groups=groups, group_id=hue.get('groupId'))
+
+  @property
+  def active_group(self):
+    """Returns the HueGroup being synced. None if not found."""
+    for group in self.groups:
+      if group.id == self.group_id:
+        return group
+    return None
+
+  def find(self, name):
+    """Finds an entertainment area by name.
+
+    Args:
+      name: Name of the entertainment area.
+
+    Returns:
+      HueGroup. None if not found.
+    """
+    for group in self.groups:
+      if group.name == name:
+        return group
+    return None
+
+
+# Device details sections and the classes parsing them.
+_SECTIONS = (
+    ('device', Device),
+    ('execution', Execution),
+    ('hdmi', Hdmi),
+    ('hue', HueGroups),
+)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class SyncBoxState(object):
+  """State of a Sync Box, shared by all the entities of the box."""
+
+  device: Device
+  execution: Execution
+  hdmi: Hdmi
+  hue: HueGroups
+
+  @classmethod
+  def from_device_details(
+          cls, device_details, previous_details=None, previous=None):
+    """Parses the device details into a state.
+
+    Sections equal to those of the previous device details are not parsed
+    again: the previous state sections are reused, so consumers can tell
+    unchanged sections apart by identity.
+
+    Args:
+      device_details: Dictionary containing device information.
+      previous_details: Device details the previous state was parsed from.
+      previous: Previous SyncBoxState.
+
+    Returns:
+      SyncBoxState. The previous one if no section changed.
+    """
+    sections = {}
+    for name, section_class in _SECTIONS:
+      source = device_details.get(name, {})
+      previous_section = None
+      if previous is not None:
+        previous_section = getattr(previous, name)
+        previous_source = previous_details.get(name, {})
+        if source is previous_source or source == previous_source:
+          sections[name] = previous_section
+          continue
+
+      if section_class is HueGroups:
+        section = HueGroups.from_dict(source, previous_section)
+      else:
+        section = section_class.from_dict(source)
+      sections[name] = (
+          previous_section if section == previous_section else section)
+
+    if previous is not None and all(
+            sections[name] is getattr(previous, name)
+            for name, _ in _SECTIONS):
+      return previous
+    return cls(**sections)
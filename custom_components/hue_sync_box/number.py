@@ -0,0 +1,47 @@
+"""Brightness of a Philips Hue Sync Box as a number entity."""
+
+from homeassistant.components import number
+
+from . import api
+from . import const
+from . import entity
+
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+  """Adds the number entities of a Philips Hue Sync Box config entry."""
+  sync_box_coordinator = hass.data[const.DATA_COORDINATORS][
+      config_entry.entry_id]
+  async_add_entities([
+      HueSyncBoxBrightness(
+          sync_box_coordinator, config_entry, 'brightness', 'Brightness'),
+  ])
+
+
+class HueSyncBoxBrightness(entity.HueSyncBoxEntity, number.NumberEntity):
+  """Brightness of the lights during sync.
+
+  Changes are throttled latest-wins, so it can be driven from a slider.
+  """
+
+  _attr_native_max_value = 200
+  _attr_native_min_value = 0
+  _attr_native_step = 1
+
+  @property
+  def native_value(self):
+    """Returns the brightness. None if unknown."""
+    return self._value
+
+  async def async_set_native_value(self, value):
+    """Sets the brightness.
+
+    Args:
+      value: Brightness, between 0 and 200.
+    """
+    await self._async_execute(
+        api.build_brightness_payload(value), throttle_key='brightness')
+
+  def _get_value(self, sync_box_state):
+    """Gets the brightness. None if unknown."""
+    brightness = sync_box_state.execution.brightness
+    return brightness if isinstance(brightness, int) else None
@@ -1,30 +1,88 @@
 """Creates Sync Box remote entity."""
 
+import asyncio
 import json
 import logging
-import os
-import requests
 
+import aiohttp
+
+from homeassistant import config_entries
+from homeassistant.components import persistent_notification
 from homeassistant.components import remote
+from homeassistant.core import callback
 from homeassistant.helpers import config_validation
-from homeassistant.helpers import entity_platform
+from homeassistant.helpers import update_coordinator
 from homeassistant import util
+import voluptuous
 
 from . import api
 from . import const
-from . import services
+from . import entity
 
 _LOGGER = logging.getLogger(__name__)
 
 _PLATFORM = 'remote'
 
 
+PLATFORM_SCHEMA = remote.PLATFORM_SCHEMA.extend({
+    voluptuous.Required(const.CONF_IP_ADDRESS): config_validation.string,
+    voluptuous.Optional(const.CONF_NAME): config_validation.string,
+    voluptuous.Optional(
+        const.CONF_POOL_SIZE, default=const.DEFAULT_POOL_SIZE):
+            voluptuous.All(voluptuous.Coerce(int), voluptuous.Range(min=1)),
+    voluptuous.Optional(
+        const.CONF_CONNECT_TIMEOUT, default=const.DEFAULT_CONNECT_TIMEOUT):
+            config_validation.positive_float,
+    voluptuous.Optional(
+        const.CONF_READ_TIMEOUT, default=const.DEFAULT_READ_TIMEOUT):
+            config_validation.positive_float,
+    voluptuous.Optional(
+        const.CONF_COALESCE_WINDOW, default=const.DEFAULT_COALESCE_WINDOW):
+            voluptuous.All(
+                voluptuous.Coerce(float), voluptuous.Range(min=0, max=1)),
+    voluptuous.Optional(
+        const.CONF_COMPACT_ATTRIBUTES,
+        default=const.DEFAULT_COMPACT_ATTRIBUTES): config_validation.boolean,
+    voluptuous.Optional(const.CONF_CACHE_TTL, default=const.DEFAULT_CACHE_TTL):
+        voluptuous.All(
+            voluptuous.Coerce(float), voluptuous.Range(min=0, max=5)),
+    voluptuous.Optional(
+        const.CONF_TRACE_SAMPLE_RATE, default=const.DEFAULT_TRACE_SAMPLE_RATE):
+            voluptuous.All(
+                voluptuous.Coerce(float), voluptuous.Range(min=0, max=1)),
+    voluptuous.Optional(
+        const.CONF_TRACE_BODY_LIMIT, default=const.DEFAULT_TRACE_BODY_LIMIT):
+            config_validation.positive_int,
+})
+
+
 async def async_setup_platform(
         hass, config, async_add_entities, discovery_info=None):
-  """Adds Philips Hue Sync Box to the list of remotes."""
-  _LOGGER.info('Setting up remotes for Hue Sync Box.')
-  services.register_services(hass)
-  async_add_entities([HueSyncBoxRemote(config, hass)], True)
+  """Imports a Philips Hue Sync Box configured in YAML as a config entry."""
+  _LOGGER.info('Importing Hue Sync Box remote configured in YAML.')
+  import_config = {
+      key: value for key, value in config.items()
+      if key != const.CONF_PLATFORM
+  }
+  hass.async_create_task(hass.config_entries.flow.async_init(
+      const.DOMAIN, context={'source': config_entries.SOURCE_IMPORT},
+      data=import_config))
+  return True
+
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+  """Adds the remote of a Philips Hue Sync Box config entry.
+
+  The first refresh is not awaited, so setting up many boxes does not delay
+  Home Assistant start up.
+  """
+  sync_box_coordinator = hass.data[const.DATA_COORDINATORS][
+      config_entry.entry_id]
+  config = {**config_entry.data, **config_entry.options}
+  async_add_entities([HueSyncBoxRemote(
+      config, hass, sync_box_coordinator, unique_id=config_entry.unique_id,
+      device_info=entity.get_device_info(
+          config_entry, sync_box_coordinator.sync_box_state))])
   return True
 
 
@@ -32,120 +90,128 @@ if not hasattr(remote, 'RemoteEntity'):  # Legacy compatibility.
   remote.RemoteEntity = remote.RemoteDevice
 
 
-class HueSyncBoxRemote(remote.RemoteEntity):
+class HueSyncBoxRemote(
+        update_coordinator.CoordinatorEntity, remote.RemoteEntity):
   """Representation of a Sync Box remote service.
 
   Properties:
     attributes: Device attributes. See below.
-    entity_id: The Entity id of this remote.
+    attributes_version: Counter increased when the attributes change.
+    available: Whether the sync box can be reached.
+    device_info: Device registry information of the sync box.
     is_on: Whether the sync box is on.
     state: Current on/off state of the syncing status.
+    unique_id: Unique id of the sync box.
 
   Attributes:
     brightness: Brightness of the lights.
+    group_active: Name of the entertainment area being synced.
+    groups: Entertainment areas by name. Not recorded.
     hdmi_active: Whether HDMI input is active.
     hdmi_source: HDMI Input selected.
-    inputs:
+    inputs: Not recorded.
       input1: Input 1 name.
       input2: Input 2 name.
       input3: Input 3 name.
       input4: Input 4 name.
     intensity: Intensity of current mode.
+    intensities: Intensity of each sync mode. Not recorded.
     name: Name of the sync box.
     sync_active: Whether syncing is active.
     sync_mode: Syncing mode state.
 
   Services:
+    dump_diagnostics: Logs and fires an event with request metrics.
     get_access_token: Gets access token.
     set_brightness: Sets brightness.
     set_hdmi_input: Sets HDMI input.
     set_intensity: Sets intensity for current mode.
+    set_state: Sets several settings at once.
     set_sync_mode: Sets Sync mode.
     toggle: Toggles active sync.
     turn_off: Turns off active sync.
     turn_on: Turns on active sync.
     update: Updates Sync Box details.
+
+  The groups, inputs and intensities attributes are larger dictionaries, so
+  they are kept out of the state history. With compact_attributes set they
+  are not exposed at all, and can be read from the diagnostics of the config
+  entry.
   """
 
-  def __init__(self, config, hass):
-    """Initializes the remote."""
+  _unrecorded_attributes = frozenset({'groups', 'inputs', 'intensities'})
+
+  def __init__(
+          self, config, hass, sync_box_coordinator, unique_id=None,
+          device_info=None):
+    """Initializes the remote.
+
+    Args:
+      config: Configuration of the Sync Box.
+      hass: Home Assistant instance.
+      sync_box_coordinator: HueSyncBoxCoordinator polling the Sync Box.
+      unique_id: Unique id of the Sync Box.
+      device_info: Device registry information of the Sync Box.
+    """
     _LOGGER.info(
         f'Started Hue Sync Box for IP {config.get(const.CONF_IP_ADDRESS)}')
+    super().__init__(sync_box_coordinator)
     self._config = config
     self._hass = hass
 
     # Config attributes.
     self._ip_address = config.get(const.CONF_IP_ADDRESS)
     self._name = config.get(const.CONF_NAME, const.DEVICE_DEFAULT_NAME)
+    self._compact_attributes = config.get(
+        const.CONF_COMPACT_ATTRIBUTES, const.DEFAULT_COMPACT_ATTRIBUTES)
     self._entity_id = util.slugify(self._name)
+    self._unique_id = unique_id
+    self._device_info = device_info
+    self.entity_id = f'{_PLATFORM}.{self._entity_id}'
 
     # API interactions.
-    self._token_file_name = const.TOKEN_FILE.format(self._entity_id)
+    self._token_store = hass.data[const.DATA_TOKEN_STORE]
     self._access_token = None
     self._entity_onboarding = False
-    self._api = api.HueSyncBoxApi(self._ip_address, self._access_token)
+    self._api = sync_box_coordinator.api
 
     # Internal attributes.
-    self._brightness = None
-    self._device_name = const.DEVICE_DEFAULT_NAME
-    self._group_active = None
-    self._groups = None
-    self._hdmi_active = None
-    self._hdmi_source = None
-    self._input1 = None
-    self._input2 = None
-    self._input3 = None
-    self._input4 = None
-    self._intensity = None
-    self._intensities = None
-    self._sync_active = None
-    self._sync_mode = None
-
-    hass.data[const.DOMAIN][self.entity_id] = self
-    _LOGGER.debug(f'Set up for {self.entity_id} completed.')
-
-  # API token set up.
-  def _get_access_token_data_from_file(self):
-    """Gets access token from the file."""
-    _LOGGER.debug(f'Getting token from file: {self._token_file_name}.')
-
-    token_file = self._hass.config.path(self._token_file_name)
-
-    if not os.path.isfile(token_file):
-      return None
-
-    with open(token_file, 'r') as token_file_content:
-      token_data = json.loads(token_file_content.read()) or {}
+    self._attributes_version = 0
+    self._last_available = None
+    self._state_attributes = None
+    self._sync_box_state = None
 
-    _LOGGER.debug(f'Token data found on file: {self._token_file_name}.')
-
-    return token_data.get('access_token')
-
-  def _store_access_token(self, access_token):
-    """Stores access token into file.
-
-    Args:
-      access_token: String containing access token.
-    """
-    access_token_json = {'access_token': access_token}
-    with open(self._token_file_name, 'w+') as token_file:
-      token_file.write(json.dumps(access_token_json))
+    _LOGGER.debug(f'Set up for {self.entity_id} completed.')
 
   # Properties.
   @property
-  def entity_id(self):
-    """Returns the entity ID for this remote."""
-    return f'{_PLATFORM}.{self._entity_id}'
+  def available(self):
+    """Returns whether the Sync Box can be reached."""
+    return super().available and not self._api.circuit_breaker.is_open
+
+  @property
+  def device_info(self):
+    """Returns the device registry information of this Sync Box."""
+    return self._device_info
 
   @property
   def is_on(self):
     """Returns true if Sync Box sync is on."""
-    return self._hdmi_active
+    if self._sync_box_state is None:
+      return None
+    return self._sync_box_state.execution.hdmi_active
 
   @property
   def name(self):
     """Returns the display name of this Sync Box."""
-    return self._name or self._device_name
+    if self._name or self._sync_box_state is None:
+      return self._name or const.DEVICE_DEFAULT_NAME
+    return self._sync_box_state.device.name
+
+  @property
+  def unique_id(self):
+    """Returns the unique id of this Sync Box."""
+    return self._unique_id
 
   @property
   def state(self):
@@ -153,31 +219,86 @@ class HueSyncBoxRemote(remote.RemoteEntity):
     return 'on' if self.is_on else 'off'
 
   # Attributes.
+  @property
+  def attributes_version(self):
+    """Returns a counter increased every time the state attributes change."""
+    return self._attributes_version
+
   @property
   def extra_state_attributes(self):
-    """Return the state attributes."""
-    return {
-        'brightness': self._brightness,
-        'device_name': self._device_name,
-        'group_active': self._group_active,
-        'groups': self._groups,
-        'hdmi_active': self._hdmi_active,
-        'hdmi_source': self._hdmi_source,
-        'inputs': {
-            'input1': self._input1,
-            'input2': self._input2,
-            'input3': self._input3,
-            'input4': self._input4,
-        },
-        'intensity': self._intensity,
-        'intensities': self._intensities,
-        'sync_active': self._sync_active,
-        'sync_mode': self._sync_mode,
+    """Return the state attributes.
+
+    The attributes are built once per change and the same dictionary is
+    returned until a value changes again. It must be treated as read-only.
+    """
+    if self._state_attributes is None:
+      self._state_attributes = self._build_state_attributes()
+    return self._state_attributes
+
+  def _build_state_attributes(self):
+    """Builds the state attributes from the state of the Sync Box.
+
+    Returns:
+      State attributes dictionary.
+    """
+    state = self._sync_box_state
+    if state is None:
+      return {'device_name': const.DEVICE_DEFAULT_NAME}
+
+    execution = state.execution
+    active_group = state.hue.active_group
+    state_attributes = {
+        'brightness': execution.brightness,
+        'device_name': state.device.name,
+        'group_active': (
+            active_group.name if active_group is not None
+            else const.DEFAULT_STR_VALUE),
+        'hdmi_active': execution.hdmi_active,
+        'hdmi_source': execution.hdmi_source,
+        'intensity': execution.intensity,
+        'sync_active': execution.sync_active,
+        'sync_mode': execution.mode,
     }
+    if not self._compact_attributes:
+      state_attributes['intensities'] = execution.intensities
+      state_attributes['groups'] = {
+          group.name: {
+              'name': group.name,
+              'numLights': group.num_lights,
+              'active': group.active,
+              'id': group.id,
+          }
+          for group in state.hue.groups
+      }
+      state_attributes['inputs'] = {
+          f'input{number}': input_name
+          for number, input_name in zip(
+              const.INPUT_VALUES, state.hdmi.input_names)
+      }
+    return state_attributes
 
   # Services.
-  def get_access_token(self):
-    """Gets access token. If file does not exist, initializes process."""
+  async def async_dump_diagnostics(self):
+    """Logs and fires an event with the request metrics of the Sync Box.
+
+    Returns:
+      Diagnostics dictionary.
+    """
+    diagnostics = {
+        'entity_id': self.entity_id,
+        'update_interval': self.coordinator.update_interval.total_seconds(),
+        'last_update_success': self.coordinator.last_update_success,
+        'circuit': self._api.circuit_breaker.state,
+        'requests': self._api.metrics.as_dict(),
+        'admission': self._api.admission.as_dict(),
+    }
+    _LOGGER.info(
+        f'Diagnostics for {self.entity_id}: {json.dumps(diagnostics)}')
+    self._hass.bus.async_fire(const.EVENT_DIAGNOSTICS, diagnostics)
+    return diagnostics
+
+  async def async_get_access_token(self):
+    """Gets access token. If it is not stored, initializes process."""
     _LOGGER.debug('Getting access token for Philips Hue Sync Box.')
 
     if self._access_token:
@@ -187,26 +308,28 @@ class HueSyncBoxRemote(remote.RemoteEntity):
       _LOGGER.debug('Entity with no name was tried. Blocking request.')
       return
 
-    access_token = self._get_access_token_data_from_file()
+    access_token = self._token_store.get_token(self._entity_id)
     if access_token:
-      _LOGGER.debug('Token file content found.')
+      _LOGGER.debug('Stored token found.')
       self._access_token = access_token
       self._api.set_access_token(access_token)
       return access_token
 
-    access_token = self._api.request_access_token(self._name)
+    access_token = await self._api.request_access_token(self._name)
     if access_token:
-      _LOGGER.debug('Token file request successful.')
+      _LOGGER.debug('Token request successful.')
       self._access_token = access_token
-      self._store_access_token(access_token)
-      self._hass.components.persistent_notification.create(
+      await self._token_store.async_set_token(self._entity_id, access_token)
+      persistent_notification.async_create(
+          self._hass,
           f'Access token for Philips Hue Sync Box {self._entity_id} '
           f'successfully obtained: {access_token}.',
           title=self._name,
           notification_id=f'hue_sync_box_setup_{self._entity_id}')
       return access_token
 
-    self._hass.components.persistent_notification.create(
+    persistent_notification.async_create(
+        self._hass,
         'No token authentication found for Philips Hue Sync Box '
         f'"{self._name}". In order to authorize Home-Assistant to use your '
         'Philips Hue Sync Box, call hue_sync_box.get_access_token for this '
@@ -218,91 +341,133 @@ class HueSyncBoxRemote(remote.RemoteEntity):
         notification_id=f'hue_sync_box_setup_{self._entity_id}')
     self._entity_onboarding = True
 
-  def learn_command(
+  async def async_learn_command(
           self, device=None, command=None, alternative=None, timeout=None):
     _LOGGER.info('Hue Sync Box remote does not support learn_command.')
 
-  def send_command(
+  async def async_send_command(
           self, device=None, command=None, num_repeats=None, delay_secs=None,
           hold_secs=None):
     _LOGGER.info('Hue Sync Box remote does not support send_command.')
 
-  def set_area(self, area_name):
+  async def async_set_area(self, area_name):
     """Sets HDMI Sync Box to a sync to a certain entertainment area name.
 
     Args:
       area_name: Name of the entertainment area to which to sync lights.
     """
-    if not self._groups:
-      self.update()
-
-    area_group = self._groups.get(area_name)
-    if not area_group:
-      raise ValueError(f'Hue entertainment area {area_name} does not exist.')
+    _LOGGER.debug(f'{self.entity_id}.async_set_area called')
+    if self._sync_box_state is None:
+      await self.async_update(scope=('hue',))
 
-    area_id = area_group['id']
-    self._api.set_target_area_group(area_id)
-    self.update()
+    area_group = self._find_area(area_name)
+    await self._async_execute(
+        api.build_target_area_group_payload(area_group.id))
 
-  def set_brightness(self, brightness):
+  async def async_set_brightness(self, brightness):
     """Sets HDMI Sync Box to a certain brightness.
 
     Args:
       brightness: Brightness of the light during sync.
     """
-    self._api.set_brightness(brightness)
-    self.update()
+    _LOGGER.debug(f'{self.entity_id}.async_set_brightness called')
+    await self._async_execute(
+        api.build_brightness_payload(brightness), throttle_key='brightness')
 
-  def set_hdmi_input(self, hdmi_input):
+  async def async_set_hdmi_input(self, hdmi_input):
     """Sets HDMI Sync box to a certain HDMI input.
 
     Args:
       hdmi_input: HDMI input number.
     """
-    self._api.set_hdmi_input(hdmi_input)
-    self.update()
+    _LOGGER.debug(f'{self.entity_id}.async_set_hdmi_input called')
+    await self._async_execute(api.build_hdmi_input_payload(hdmi_input))
 
-  def set_intensity(self, intensity, sync_mode=None):
+  async def async_set_intensity(self, intensity, sync_mode=None):
     """Sets HDMI Sync Box to a certain intensity mode
 
     Args:
       intensity: Intensity level.
       sync_mode: Mode of which to set up intensity.
     """
+    _LOGGER.debug(f'{self.entity_id}.async_set_intensity called')
     if not sync_mode:
-      self.update()
-      sync_mode = self._sync_mode
+      if self._sync_box_state is None:
+        await self.async_update(scope=('execution',))
+      sync_mode = self._get_sync_mode()
+
+    await self._async_execute(
+        api.build_intensity_payload(intensity, sync_mode),
+        throttle_key=f'{str(sync_mode).lower()}_intensity')
+
+  async def async_set_state(
+          self, sync_mode=None, hdmi_input=None, brightness=None,
+          intensity=None, area_name=None):
+    """Sets several HDMI Sync Box settings in a single request.
 
-    self._api.set_intensity(intensity, sync_mode)
-    self.update()
+    All values are validated before anything is sent to the Sync Box.
 
-  def set_sync_mode(self, sync_mode):
+    Args:
+      sync_mode: Sync mode to which to set up Sync box.
+      hdmi_input: HDMI input number.
+      brightness: Brightness of the light during sync.
+      intensity: Intensity level of the given or current sync mode.
+      area_name: Name of the entertainment area to which to sync lights.
+    """
+    _LOGGER.debug(f'{self.entity_id}.async_set_state called')
+    needs_state = (
+        area_name is not None or (intensity is not None and not sync_mode))
+    if needs_state and self._sync_box_state is None:
+      await self.async_update()
+
+    payloads = []
+    if sync_mode is not None:
+      payloads.append(api.build_sync_mode_payload(sync_mode))
+    if hdmi_input is not None:
+      payloads.append(api.build_hdmi_input_payload(hdmi_input))
+    if brightness is not None:
+      payloads.append(api.build_brightness_payload(brightness))
+    if intensity is not None:
+      payloads.append(
+          api.build_intensity_payload(
+              intensity, sync_mode or self._get_sync_mode()))
+    if area_name is not None:
+      payloads.append(api.build_target_area_group_payload(
+          self._find_area(area_name).id))
+
+    if not payloads:
+      return
+
+    payload = {}
+    for partial_payload in payloads:
+      payload = api.merge_execution_payloads(payload, partial_payload)
+    await self._async_execute(payload)
+
+  async def async_set_sync_mode(self, sync_mode):
     """Sets HDMI Sync Box to a certain sync mode.
 
     Args:
       sync_mode: Sync mode to which to set up Sync box.
     """
-    self._api.set_sync_mode(sync_mode)
-    self.update()
+    _LOGGER.debug(f'{self.entity_id}.async_set_sync_mode called')
+    await self._async_execute(api.build_sync_mode_payload(sync_mode))
 
-  def toggle(self):
+  async def async_toggle(self, **kwargs):
     """Turns on or off depending on status."""
-    _LOGGER.debug(f'Toggling based on status {self._hdmi_active}.')
-    self.update()
+    if self._sync_box_state is None:
+      await self.async_update(scope=('execution',))
 
-    if self._hdmi_active is True:
-      self.turn_off()
+    _LOGGER.debug(f'Toggling based on status {self.is_on}.')
+    if self.is_on is True:
+      await self.async_turn_off()
     else:
-      self.turn_on()
-
-    self.update()
+      await self.async_turn_on()
 
-  def turn_off(self):
+  async def async_turn_off(self, **kwargs):
     """Turns off."""
-    self.set_sync_mode('powersave')
-    self.update()
+    await self.async_set_sync_mode('powersave')
 
-  def turn_on(self, activity=const.DEFAULT_SYNC_MODE):
+  async def async_turn_on(self, activity=const.DEFAULT_SYNC_MODE, **kwargs):
     """Turns on.
 
     Args:
@@ -310,11 +475,15 @@ class HueSyncBoxRemote(remote.RemoteEntity):
     """
     if not activity:
       activity = const.DEFAULT_SYNC_MODE
-    self.set_sync_mode(activity)
-    self.update()
+    await self.async_set_sync_mode(activity)
 
-  def update(self):
-    """Updates device status."""
+  async def async_update(self, scope=None):
+    """Updates device status.
+
+    Args:
+      scope: Names of the sections of the device details to refresh, e.g.
+        ('execution',). Defaults to all sections.
+    """
     if self._entity_onboarding and not self._access_token:
       _LOGGER.debug(
           f'Hue Sync Box {self._entity_id} needs to get onboarded before '
@@ -322,7 +491,7 @@ class HueSyncBoxRemote(remote.RemoteEntity):
       return
 
     if not self._access_token:
-      self.get_access_token()
+      await self.async_get_access_token()
 
     if not self._access_token:
       return
@@ -330,107 +499,103 @@ class HueSyncBoxRemote(remote.RemoteEntity):
     if self._entity_onboarding:
       self._entity_onboarding = False
 
-    info = self._api.get_device_details()
-
-    device = info.get('device', {})
-    self._device_name = device.get('name', const.DEVICE_DEFAULT_NAME)
-
-    execution = info.get('execution', {})
-    self._brightness = execution.get('brightness', const.DEFAULT_STR_VALUE)
-    self._hdmi_active = execution.get('hdmiActive', const.DEFAULT_STR_VALUE)
-    self._hdmi_source = execution.get('hdmiSource', const.DEFAULT_STR_VALUE)
-    self._sync_active = execution.get('syncActive', const.DEFAULT_STR_VALUE)
-    self._sync_mode = execution.get('mode', const.DEFAULT_STR_VALUE)
-
-    video = execution.get('video', {})
-    game = execution.get('game', {})
-    music = execution.get('music', {})
-    self._intensities = {
-        'video': video.get('intensity'),
-        'game': game.get('intensity'),
-        'music': music.get('intensity'),
-    }
-    self._intensity = (
-        self._intensities[self._sync_mode]
-        if self._sync_mode in self._intensities
-        else 'off'
-    )
-
-    hdmi = info.get('hdmi', {})
-    input1 = hdmi.get('input1', {})
-    self._input1 = input1.get('name', 'HDMI 1')
-    input2 = hdmi.get('input2', {})
-    self._input2 = input2.get('name', 'HDMI 2')
-    input3 = hdmi.get('input3', {})
-    self._input3 = input3.get('name', 'HDMI 3')
-    input4 = hdmi.get('input4', {})
-    self._input4 = input4.get('name', 'HDMI 4')
-
-    hue = info.get('hue', {})
-    hue_groups = hue.get('groups', {})
-    groups = {}
-    for group_id, group_data in hue_groups.items():
-      new_group_data = group_data.copy()
-      new_group_data['id'] = group_id
-      group_name = new_group_data['name']
-      groups[group_name] = new_group_data
-    self._groups = groups
-
-    active_group_id = hue.get('groupId')
-    active_group = hue_groups.get(active_group_id, {})
-    self._group_active = active_group.get('name', const.DEFAULT_STR_VALUE)
-
-  # Async wrappers.
-  async def async_get_access_token(self):
-    _LOGGER.debug(f'{self.entity_id}.async_get_access_token called')
-    await self._hass.async_add_executor_job(self.get_access_token)
+    await self.coordinator.async_fetch(scope)
+    if self.coordinator.sync_box_state is not None:
+      self._apply_state(self.coordinator.sync_box_state)
+
+  # Entity lifecycle.
+  async def async_added_to_hass(self):
+    """Registers the entity and starts the first refresh in the background."""
+    await super().async_added_to_hass()
+    self._hass.data[const.DOMAIN][self.entity_id] = self
+    if self.coordinator.sync_box_state is not None:
+      self._apply_state(self.coordinator.sync_box_state)
+    self._hass.async_create_task(self._async_initial_update())
+
+  async def async_will_remove_from_hass(self):
+    """Unregisters the entity."""
+    await super().async_will_remove_from_hass()
+    self._hass.data[const.DOMAIN].pop(self.entity_id, None)
+
+  async def _async_initial_update(self):
+    """Runs the first update, logging failures as nobody awaits it."""
+    try:
+      await self.async_update()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as error:
+      _LOGGER.warning(
+          'Unable to reach Hue Sync Box %s on start up: %r. It will be '
+          'retried on the next update.', self.entity_id, error)
+
+  # Coordinator updates.
+  @callback
+  def _handle_coordinator_update(self):
+    """Applies the device details shared by the coordinator.
+
+    State is only written when a value or the availability changed.
+    """
+    changed = False
+    if self.coordinator.sync_box_state is not None:
+      changed = self._apply_state(self.coordinator.sync_box_state)
 
-  async def async_learn_command(
-          self, device=None, command=None, alternative=None, timeout=None):
-    _LOGGER.debug(f'{self.entity_id}.async_learn_command called')
-    await self._hass.async_add_executor_job(
-        self.learn_command, device, command, alternative, timeout)
+    available = self.available
+    if changed or available != self._last_available:
+      self._last_available = available
+      self.async_write_ha_state()
 
-  async def async_send_command(
-          self, device=None, command=None, num_repeats=None, delay_secs=None,
-          hold_secs=None):
-    _LOGGER.debug(f'{self.entity_id}.async_send_command called')
-    await self._hass.async_add_executor_job(
-        self.send_command, device, command, num_repeats, delay_secs, hold_secs)
+  # Optimistic state.
+  async def _async_execute(self, payload, throttle_key=None):
+    """Sends an execution payload and applies it to the known state.
 
-  async def async_set_area(self, area_name):
-    _LOGGER.debug(f'{self.entity_id}.async_set_area called')
-    await self._hass.async_add_executor_job(self.set_area, area_name)
+    The state is written straight away from the accepted payload and a
+    single debounced refresh reconciles it with the Sync Box afterwards.
+    Payloads superseded by a newer one with the same throttle key are neither
+    sent nor applied.
 
-  async def async_set_brightness(self, brightness):
-    _LOGGER.debug(f'{self.entity_id}.async_set_brightness called')
-    await self._hass.async_add_executor_job(self.set_brightness, brightness)
+    Args:
+      payload: Execution payload to send to the Sync Box.
+      throttle_key: Name of the setting changed, to drop superseded values.
+    """
+    if await self._api.set_execution(payload, throttle_key=throttle_key):
+      await self.coordinator.async_apply_execution(payload)
 
-  async def async_set_hdmi_input(self, hdmi_input):
-    _LOGGER.debug(f'{self.entity_id}.async_set_hdmi_input called')
-    await self._hass.async_add_executor_job(self.set_hdmi_input, hdmi_input)
+  def _apply_state(self, sync_box_state):
+    """Applies the state of the Sync Box shared by the coordinator.
 
-  async def async_set_intensity(self, intensity, sync_mode=None):
-    _LOGGER.debug(f'{self.entity_id}.async_set_intensity called')
-    await self._hass.async_add_executor_job(
-        self.set_intensity, intensity, sync_mode)
+    Unchanged states and sections are shared between fetches, so changes are
+    detected by identity.
 
-  async def async_set_sync_mode(self, sync_mode):
-    _LOGGER.debug(f'{self.entity_id}.async_set_sync_mode called')
-    await self._hass.async_add_executor_job(self.set_sync_mode, sync_mode)
+    Args:
+      sync_box_state: models.SyncBoxState of the Sync Box.
 
-  async def async_toggle(self):
-    _LOGGER.debug(f'{self.entity_id}.async_toggle called')
-    await self._hass.async_add_executor_job(self.toggle)
+    Returns:
+      Whether the state changed.
+    """
+    if sync_box_state is self._sync_box_state:
+      return False
+    self._sync_box_state = sync_box_state
+    self._state_attributes = None
+    self._attributes_version += 1
+    return True
+
+  # Helpers.
+  def _find_area(self, area_name):
+    """Finds a Hue entertainment area by name.
 
-  async def async_turn_off(self):
-    _LOGGER.debug(f'{self.entity_id}.async_turn_off called')
-    await self._hass.async_add_executor_job(self.turn_off)
+    Args:
+      area_name: Name of the entertainment area.
 
-  async def async_turn_on(self, activity=None):
-    _LOGGER.debug(f'{self.entity_id}.async_turn_on called')
-    await self._hass.async_add_executor_job(self.turn_on, activity)
+    Returns:
+      models.HueGroup of the area.
+    """
+    area_group = None
+    if self._sync_box_state is not None:
+      area_group = self._sync_box_state.hue.find(area_name)
+    if area_group is None:
+      raise ValueError(f'Hue entertainment area {area_name} does not exist.')
+    return area_group
 
-  async def async_update(self):
-    _LOGGER.debug(f'{self.entity_id}.async_update called')
-    await self._hass.async_add_executor_job(self.update)
+  def _get_sync_mode(self):
+    """Gets the current sync mode. None if not known yet."""
+    if self._sync_box_state is None:
+      return None
+    return self._sync_box_state.execution.mode
@@ -0,0 +1,210 @@
+"""Retries and circuit breaking for requests to unreachable Sync Boxes."""
+
+import asyncio
+import logging
+import random
+import time
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+# Circuit breaker states.
+STATE_CLOSED = 'closed'
+STATE_HALF_OPEN = 'half_open'
+STATE_OPEN = 'open'
+
+
+class CircuitOpenError(aiohttp.ClientConnectionError):
+  """Raised instead of calling a Sync Box whose circuit is open."""
+
+
+def is_transient_error(error):
+  """Gets whether a request error may not happen again if retried.
+
+  Args:
+    error: Exception raised by the request.
+
+  Returns:
+    Whether the error is a timeout, a connection error or a server error.
+  """
+  if isinstance(error, aiohttp.ClientResponseError):
+    return error.status >= 500
+  return isinstance(
+      error, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+def get_backoff_delay(attempt, base_delay):
+  """Gets the delay before a retry, with full jitter.
+
+  Args:
+    attempt: Number of the failed attempt, starting at 0.
+    base_delay: Maximum delay, in seconds, after the first attempt.
+
+  Returns:
+    Seconds to wait, random between 0 and base_delay * 2 ** attempt.
+  """
+  return random.uniform(0, base_delay * 2 ** attempt)
+
+
+async def async_retry(call, retries, base_delay):
+  """Awaits a call, retrying it with jittered backoff on transient errors.
+
+  Only idempotent calls should be retried.
+
+  Args:
+    call: Coroutine function to call without arguments.
+    retries: Maximum number of retries after the first attempt.
+    base_delay: Maximum delay, in seconds, before the first retry.
+
+  Returns:
+    Result of the call.
+  """
+  for attempt in range(retries + 1):
+    try:
+      return await call()
+    except Exception as error:  # pylint: disable=broad-except
+      if attempt == retries or not is_transient_error(error):
+        raise
+      delay = get_backoff_delay(attempt, base_delay)
+      _LOGGER.debug(
+          'Request failed (%r). Retrying in %.2f seconds.', error, delay)
+      await asyncio.sleep(delay)
+
+
+class CircuitBreaker(object):
+  """Fails fast while a Sync Box keeps failing.
+
+  After failure_threshold consecutive transient errors the circuit opens and
+  calls raise CircuitOpenError without reaching the box. Once reset_timeout
+  has passed, a single cheap probe request is sent: if it succeeds the circuit
+  closes and calls go through again, otherwise it stays open for another
+  reset_timeout.
+
+  Properties:
+    is_open: Whether calls currently fail fast.
+    state: Current state of the circuit.
+
+  Public Methods:
+    add_listener: Adds a callback called when the state changes.
+    async_call: Awaits a call through the circuit.
+  """
+
+  def __init__(self, name, failure_threshold, reset_timeout):
+    """Initializes a closed circuit.
+
+    Args:
+      name: Name of the Sync Box, used for logging.
+      failure_threshold: Consecutive transient errors that open the circuit.
+      reset_timeout: Seconds to wait before probing an open circuit.
+    """
+    self._name = name
+    self._failure_threshold = failure_threshold
+    self._reset_timeout = reset_timeout
+    self._state = STATE_CLOSED
+    self._failures = 0
+    self._opened_at = 0
+    self._probe_lock = asyncio.Lock()
+    self._listeners = []
+
+  @property
+  def is_open(self):
+    """Returns whether calls currently fail fast."""
+    return self._state != STATE_CLOSED
+
+  @property
+  def state(self):
+    """Returns the current state of the circuit."""
+    return self._state
+
+  def add_listener(self, listener):
+    """Adds a callback called, without arguments, when the state changes.
+
+    Args:
+      listener: Callback to add.
+    """
+    self._listeners.append(listener)
+
+  async def async_call(self, call, probe=None):
+    """Awaits a call through the circuit.
+
+    Args:
+      call: Coroutine function to call without arguments.
+      probe: Coroutine function sending a cheap request to check whether the
+        box is reachable again. Without one, the call itself is the probe.
+
+    Returns:
+      Result of the call.
+
+    Raises:
+      CircuitOpenError: The circuit is open.
+    """
+    if self._state != STATE_CLOSED:
+      await self._async_probe(probe or call)
+
+    try:
+      result = await call()
+    except Exception as error:  # pylint: disable=broad-except
+      if is_transient_error(error):
+        self._record_failure()
+      raise
+    self._failures = 0
+    return result
+
+  async def _async_probe(self, probe):
+    """Probes an open circuit, closing it if the box answers.
+
+    Concurrent callers wait for a single probe.
+
+    Args:
+      probe: Coroutine function to call without arguments.
+
+    Raises:
+      CircuitOpenError: The circuit is still open.
+    """
+    async with self._probe_lock:
+      if self._state == STATE_CLOSED:
+        return
+      remaining = self._opened_at + self._reset_timeout - time.monotonic()
+      if remaining > 0:
+        raise CircuitOpenError(
+            f'Sync Box {self._name} is unreachable. Retrying in '
+            f'{remaining:.0f} seconds.')
+
+      self._set_state(STATE_HALF_OPEN)
+      try:
+        await probe()
+      except Exception as error:  # pylint: disable=broad-except
+        if is_transient_error(error):
+          self._open()
+          raise CircuitOpenError(
+              f'Sync Box {self._name} is still unreachable: {error!r}') from (
+                  error)
+      self._failures = 0
+      self._set_state(STATE_CLOSED)
+
+  def _record_failure(self):
+    """Counts a transient error, opening the circuit past the threshold."""
+    self._failures += 1
+    if self._failures >= self._failure_threshold:
+      self._open()
+
+  def _open(self):
+    """Opens the circuit for reset_timeout seconds."""
+    self._opened_at = time.monotonic()
+    self._set_state(STATE_OPEN)
+
+  def _set_state(self, state):
+    """Sets the state of the circuit, notifying listeners on changes.
+
+    Args:
+      state: New state.
+    """
+    if state == self._state:
+      return
+    _LOGGER.info(
+        'Sync Box %s circuit changed from %s to %s.',
+        self._name, self._state, state)
+    self._state = state
+    for listener in self._listeners:
+      listener()
@@ -0,0 +1,135 @@
+"""Settings of a Philips Hue Sync Box as select entities."""
+
+from homeassistant.components import select
+
+from . import api
+from . import const
+from . import entity
+
+
+async def async_setup_entry(hass, config_entry, async_add_entities):
+  """Adds the select entities of a Philips Hue Sync Box config entry."""
+  sync_box_coordinator = hass.data[const.DATA_COORDINATORS][
+      config_entry.entry_id]
+  async_add_entities([
+      HueSyncBoxAreaSelect(
+          sync_box_coordinator, config_entry, 'area', 'Entertainment area'),
+      HueSyncBoxHdmiInputSelect(
+          sync_box_coordinator, config_entry, 'hdmi_input', 'HDMI input'),
+      HueSyncBoxIntensitySelect(
+          sync_box_coordinator, config_entry, 'intensity', 'Intensity'),
+      HueSyncBoxSyncModeSelect(
+          sync_box_coordinator, config_entry, 'sync_mode', 'Sync mode'),
+  ])
+
+
+class _HueSyncBoxSelect(entity.HueSyncBoxEntity, select.SelectEntity):
+  """Select entity whose value is a tuple of current option and options."""
+
+  @property
+  def current_option(self):
+    """Returns the selected option. None if unknown."""
+    return self._value[0] if self._value is not None else None
+
+  @property
+  def options(self):
+    """Returns the options that can be selected."""
+    return list(self._value[1]) if self._value is not None else []
+
+
+class HueSyncBoxAreaSelect(_HueSyncBoxSelect):
+  """Hue entertainment area the lights are synced to."""
+
+  async def async_select_option(self, option):
+    """Syncs the lights to an entertainment area.
+
+    Args:
+      option: Name of the entertainment area.
+    """
+    area_group = self.coordinator.sync_box_state.hue.find(option)
+    if area_group is None:
+      raise ValueError(f'Hue entertainment area {option} does not exist.')
+    await self._async_execute(
+        api.build_target_area_group_payload(area_group.id))
+
+  def _get_value(self, sync_box_state):
+    """Gets the active area and the names of all areas."""
+    active_group = sync_box_state.hue.active_group
+    return (
+        active_group.name if active_group is not None else None,
+        tuple(group.name for group in sync_box_state.hue.groups))
+
+
+class HueSyncBoxHdmiInputSelect(_HueSyncBoxSelect):
+  """HDMI input being synced, by input name."""
+
+  async def async_select_option(self, option):
+    """Switches to an HDMI input.
+
+    Args:
+      option: Name of the HDMI input.
+    """
+    input_names = self.coordinator.sync_box_state.hdmi.input_names
+    await self._async_execute(api.build_hdmi_input_payload(
+        const.INPUT_VALUES[input_names.index(option)]))
+
+  def _get_value(self, sync_box_state):
+    """Gets the name of the current input and the names of all inputs."""
+    input_names = sync_box_state.hdmi.input_names
+    current_input = None
+    for number, input_name in zip(const.INPUT_VALUES, input_names):
+      if sync_box_state.execution.hdmi_source == f'input{number}':
+        current_input = input_name
+    return current_input, input_names
+
+
+class HueSyncBoxIntensitySelect(_HueSyncBoxSelect):
+  """Intensity of the current sync mode.
+
+  Unavailable in passthrough and powersave, which have no intensity.
+  """
+
+  @property
+  def available(self):
+    """Returns whether the Sync Box is in a mode with an intensity."""
+    return (
+        super().available and
+        self.coordinator.sync_box_state.execution.mode in
+        const.ACTIVE_SYNC_MODES)
+
+  async def async_select_option(self, option):
+    """Sets the intensity of the current sync mode.
+
+    Args:
+      option: Intensity level.
+    """
+    sync_mode = self.coordinator.sync_box_state.execution.mode
+    await self._async_execute(
+        api.build_intensity_payload(option, sync_mode),
+        throttle_key=f'{sync_mode}_intensity')
+
+  def _get_value(self, sync_box_state):
+    """Gets the current intensity and the intensity levels."""
+    intensity = sync_box_state.execution.intensity
+    return (
+        intensity if intensity in const.INTENSITY_OPTIONS else None,
+        const.INTENSITY_OPTIONS)
+
+
+class HueSyncBoxSyncModeSelect(_HueSyncBoxSelect):
+  """Sync mode of the Sync Box."""
+
+  async def async_select_option(self, option):
+    """Sets the sync mode.
+
+    Args:
+      option: Sync mode.
+    """
+    await self._async_execute(api.build_sync_mode_payload(option))
+
+  def _get_value(self, sync_box_state):
+    """Gets the current sync mode and the sync modes."""
+    sync_mode = sync_box_state.execution.mode
+    return (
+        sync_mode if sync_mode in const.SYNC_MODE_VALUES else None,
+        const.SYNC_MODE_VALUES)
@@ -1,15 +1,18 @@
 """Defines services that Hue Sync Box component supports."""
 
+import asyncio
 import logging
 import voluptuous
 
+from homeassistant import exceptions
 from homeassistant.helpers import config_validation
-from homeassistant.helpers import service
 
 from . import const
 
 _LOGGER = logging.getLogger(__name__)
 
+DUMP_DIAGNOSTICS_SCHEMA = config_validation.make_entity_service_schema({})
+
 GET_ACCESS_TOKEN_SCHEMA = config_validation.make_entity_service_schema({})
 
 SET_AREA_SCHEMA = config_validation.make_entity_service_schema({
@@ -29,6 +32,20 @@ SET_INTENSITY_SCHEMA = config_validation.make_entity_service_schema({
     voluptuous.Optional(const.ATTR_SYNC_MODE): config_validation.string,
 })
 
+SET_STATE_SCHEMA = config_validation.make_entity_service_schema({
+    voluptuous.Optional(const.ATTR_AREA_NAME): config_validation.string,
+    voluptuous.Optional(const.ATTR_BRIGHTNESS): voluptuous.All(
+        voluptuous.Coerce(int), voluptuous.Range(min=0, max=200)),
+    voluptuous.Optional(const.ATTR_HDMI_INPUT): voluptuous.All(
+        config_validation.string, voluptuous.In(const.INPUT_VALUES)),
+    voluptuous.Optional(const.ATTR_INTENSITY): voluptuous.All(
+        config_validation.string, voluptuous.Lower,
+        voluptuous.In(const.INTENSITY_VALUES)),
+    voluptuous.Optional(const.ATTR_SYNC_MODE): voluptuous.All(
+        config_validation.string, voluptuous.Lower,
+        voluptuous.In(const.SYNC_MODE_VALUES)),
+})
+
 SET_SYNC_MODE_SCHEMA = config_validation.make_entity_service_schema({
     voluptuous.Required(const.ATTR_SYNC_MODE): config_validation.string,
 })
@@ -38,6 +55,14 @@ def register_services(hass):
   """Registers custom services for hue_sync_box."""
   _LOGGER.debug('Registering services for Hue Sync Box.')
 
+  dump_diagnostics_service = create_dump_diagnostics_service(hass)
+  hass.services.async_register(
+      const.DOMAIN,
+      const.SERVICE_DUMP_DIAGNOSTICS,
+      dump_diagnostics_service,
+      schema=DUMP_DIAGNOSTICS_SCHEMA,
+  )
+
   get_access_token_service = create_get_access_token_service(hass)
   hass.services.async_register(
       const.DOMAIN,
@@ -54,7 +79,7 @@ def register_services(hass):
       schema=SET_AREA_SCHEMA,
   )
 
-  set_brightness_service = create_get_access_token_service(hass)
+  set_brightness_service = create_set_brightness(hass)
   hass.services.async_register(
       const.DOMAIN,
       const.SERVICE_SET_BRIGHTNESS,
@@ -78,6 +103,14 @@ def register_services(hass):
       schema=SET_INTENSITY_SCHEMA,
   )
 
+  set_state_service = create_set_state_service(hass)
+  hass.services.async_register(
+      const.DOMAIN,
+      const.SERVICE_SET_STATE,
+      set_state_service,
+      schema=SET_STATE_SCHEMA,
+  )
+
   sync_mode_service = create_set_sync_mode_service(hass)
   hass.services.async_register(
       const.DOMAIN,
@@ -89,14 +122,74 @@ def register_services(hass):
 
 def unregister_services(hass):
   """Unregisters custom services from hue_sync_box."""
+  hass.services.async_remove(const.DOMAIN, const.SERVICE_DUMP_DIAGNOSTICS)
   hass.services.async_remove(const.DOMAIN, const.SERVICE_GET_ACCESS_TOKEN)
   hass.services.async_remove(const.DOMAIN, const.SERVICE_SET_AREA)
   hass.services.async_remove(const.DOMAIN, const.SERVICE_SET_BRIGHTNESS)
   hass.services.async_remove(const.DOMAIN, const.SERVICE_SET_HDMI_INPUT)
   hass.services.async_remove(const.DOMAIN, const.SERVICE_SET_INTENSITY)
+  hass.services.async_remove(const.DOMAIN, const.SERVICE_SET_STATE)
   hass.services.async_remove(const.DOMAIN, const.SERVICE_SET_SYNC_MODE)
 
 
+async def async_call_entities(hass, call, entity_call):
+  """Runs a service call concurrently on all the targeted entities.
+
+  At most the configured number of entities are called at the same time. A
+  failing or slow entity does not stop the calls to the other entities.
+
+  Args:
+    hass: Home Assistant instance.
+    call: Service call, containing the targeted entity ids.
+    entity_call: Function receiving an entity and returning the awaitable to
+      run for it.
+
+  Raises:
+    HomeAssistantError: If the call failed for any of the entities.
+  """
+  entity_ids = call.data.get(const.ATTR_ENTITY_ID) or []
+  max_parallel_calls = hass.data.get(const.DATA_CONFIG, {}).get(
+      const.CONF_MAX_PARALLEL_CALLS, const.DEFAULT_MAX_PARALLEL_CALLS)
+  semaphore = asyncio.Semaphore(max_parallel_calls)
+
+  async def async_call_entity(entity_id):
+    entity = hass.data[const.DOMAIN].get(entity_id)
+    if not entity:
+      _LOGGER.warning(f'Hue Sync Box entity {entity_id} not found.')
+      return
+    async with semaphore:
+      await entity_call(entity)
+
+  results = await asyncio.gather(
+      *(async_call_entity(entity_id) for entity_id in entity_ids),
+      return_exceptions=True)
+
+  failed_entity_ids = []
+  for entity_id, result in zip(entity_ids, results):
+    if isinstance(result, Exception):
+      _LOGGER.error(
+          f'hue_sync_box.{call.service} failed for {entity_id}: {result!r}')
+      failed_entity_ids.append(entity_id)
+
+  if failed_entity_ids:
+    raise exceptions.HomeAssistantError(
+        f'hue_sync_box.{call.service} failed for: '
+        f'{", ".join(failed_entity_ids)}.')
+
+
+def create_dump_diagnostics_service(hass):
+  """Returns service for dump_diagnostics."""
+  async def async_dump_diagnostics(call):
+    _LOGGER.debug(
+        f'hue_syc_box async_dump_diagnostics handler called '
+        f'with data: {call.data}.')
+
+    await async_call_entities(
+        hass, call, lambda entity: entity.async_dump_diagnostics())
+
+  return async_dump_diagnostics
+
+
 def create_get_access_token_service(hass):
   """Returns service for get_access_token."""
   async def async_get_access_token(call):
@@ -104,12 +197,8 @@ def create_get_access_token_service(hass):
         f'hue_syc_box async_get_access_token handler called '
         f'with data: {call.data}.')
 
-    entity_ids = call.data.get(const.ATTR_ENTITY_ID)
-
-    for entity_id in entity_ids:
-      entity = hass.data[const.DOMAIN].get(entity_id)
-      if entity_id:
-        await entity.async_get_access_token()
+    await async_call_entities(
+        hass, call, lambda entity: entity.async_get_access_token())
 
   return async_get_access_token
 
@@ -121,13 +210,10 @@ def create_set_area(hass):
         f'hue_syc_box async_set_area handler called '
         f'with data: {call.data}.')
 
-    entity_ids = call.data.get(const.ATTR_ENTITY_ID)
     area_name = call.data.get(const.ATTR_AREA_NAME)
 
-    for entity_id in entity_ids:
-      entity = hass.data[const.DOMAIN].get(entity_id)
-      if entity_id:
-        await entity.async_set_area(area_name)
+    await async_call_entities(
+        hass, call, lambda entity: entity.async_set_area(area_name))
 
   return async_set_area
 
@@ -139,13 +225,10 @@ def create_set_brightness(hass):
         f'hue_syc_box async_set_brightness handler called '
         f'with data: {call.data}.')
 
-    entity_ids = call.data.get(const.ATTR_ENTITY_ID)
     brightness = call.data.get(const.ATTR_BRIGHTNESS)
 
-    for entity_id in entity_ids:
-      entity = hass.data[const.DOMAIN].get(entity_id)
-      if entity_id:
-        await entity.async_set_brightness(brightness)
+    await async_call_entities(
+        hass, call, lambda entity: entity.async_set_brightness(brightness))
 
   return async_set_brightness
 
@@ -157,13 +240,10 @@ def create_set_hdmi_input_service(hass):
         f'hue_syc_box create_set_hdmi_input_service handler called '
         f'with data: {call.data}.')
 
-    entity_ids = call.data.get(const.ATTR_ENTITY_ID)
     hdmi_input = call.data.get(const.ATTR_HDMI_INPUT)
 
-    for entity_id in entity_ids:
-      entity = hass.data[const.DOMAIN].get(entity_id)
-      if entity_id:
-        await entity.async_set_hdmi_input(hdmi_input)
+    await async_call_entities(
+        hass, call, lambda entity: entity.async_set_hdmi_input(hdmi_input))
 
   return async_set_hdmi_input
 
@@ -175,18 +255,37 @@ def create_set_intensity_service(hass):
         f'hue_syc_box async_set_intensity handler called '
         f'with data: {call.data}.')
 
-    entity_ids = call.data.get(const.ATTR_ENTITY_ID)
     intensity = call.data.get(const.ATTR_INTENSITY)
     sync_mode = call.data.get(const.ATTR_SYNC_MODE)
 
-    for entity_id in entity_ids:
-      entity = hass.data[const.DOMAIN].get(entity_id)
-      if entity_id:
-        await entity.async_set_intensity(intensity, sync_mode)
+    await async_call_entities(
+        hass, call,
+        lambda entity: entity.async_set_intensity(intensity, sync_mode))
 
   return async_set_intensity
 
 
+def create_set_state_service(hass):
+  """Returns service for set_state."""
+  async def async_set_state(call):
+    _LOGGER.debug(
+        f'hue_syc_box async_set_state handler called '
+        f'with data: {call.data}.')
+
+    state = {
+        'area_name': call.data.get(const.ATTR_AREA_NAME),
+        'brightness': call.data.get(const.ATTR_BRIGHTNESS),
+        'hdmi_input': call.data.get(const.ATTR_HDMI_INPUT),
+        'intensity': call.data.get(const.ATTR_INTENSITY),
+        'sync_mode': call.data.get(const.ATTR_SYNC_MODE),
+    }
+
+    await async_call_entities(
+        hass, call, lambda entity: entity.async_set_state(**state))
+
+  return async_set_state
+
+
 def create_set_sync_mode_service(hass):
   """Returns service for set_sync_mode."""
   async def async_set_sync_mode(call):
@@ -194,12 +293,9 @@ def create_set_sync_mode_service(hass):
         f'hue_syc_box async_set_sync_mode handler called '
         f'with data: {call.data}.')
 
-    entity_ids = call.data.get(const.ATTR_ENTITY_ID)
     sync_mode = call.data.get(const.ATTR_SYNC_MODE)
 
-    for entity_id in entity_ids:
-      entity = hass.data[const.DOMAIN].get(entity_id)
-      if entity_id:
-        await entity.async_set_sync_mode(sync_mode)
+    await async_call_entities(
+        hass, call, lambda entity: entity.async_set_sync_mode(sync_mode))
 
   return async_set_sync_mode
@@ -0,0 +1,77 @@
+"""Stores the last known device details of a Sync Box across restarts."""
+
+import logging
+
+from homeassistant.helpers import storage
+
+from . import const
+
+_LOGGER = logging.getLogger(__name__)
+
+# Device details sections restored on start up.
+_STORED_SECTIONS = ('device', 'execution', 'hdmi', 'hue')
+
+
+class SyncBoxStateStore(object):
+  """Last known device details of one Sync Box, persisted in storage.
+
+  Saves are skipped when the stored sections did not change, and otherwise
+  delayed and coalesced, so frequent refreshes only write to disk once per
+  save delay. Pending saves are flushed when Home Assistant stops.
+
+  Public Methods:
+    async_load: Loads the stored device details.
+    async_remove: Removes the stored device details.
+    async_schedule_save: Schedules saving the device details.
+  """
+
+  def __init__(self, hass, box_id):
+    """Initializes the store.
+
+    Args:
+      hass: Home Assistant instance.
+      box_id: Id of the box, e.g. its config entry id.
+    """
+    self._store = storage.Store(
+        hass, const.STATE_STORAGE_VERSION,
+        const.STATE_STORAGE_KEY.format(box_id))
+    self._stored_details = None
+
+  async def async_load(self):
+    """Loads the stored device details.
+
+    Returns:
+      Dictionary containing device information. None if none was stored.
+    """
+    data = await self._store.async_load()
+    if not data:
+      return None
+    _LOGGER.debug('Restored device details from %s.', self._store.key)
+    self._stored_details = data.get('device_details')
+    return self._stored_details
+
+  async def async_remove(self):
+    """Removes the stored device details."""
+    await self._store.async_remove()
+
+  def async_schedule_save(self, device_details):
+    """Schedules saving the device details after the save delay.
+
+    Nothing is saved if the restored sections equal the stored ones.
+
+    Args:
+      device_details: Dictionary containing device information.
+    """
+    stored_details = {
+        section: device_details[section]
+        for section in _STORED_SECTIONS
+        if section in device_details
+    }
+    if stored_details == self._stored_details:
+      return
+    self._stored_details = stored_details
+    self._store.async_delay_save(self._get_data, const.STATE_SAVE_DELAY)
+
+  def _get_data(self):
+    """Gets the data to store."""
+    return {'device_details': self._stored_details}
@@ -0,0 +1,92 @@
+"""Latest-wins throttling of high-frequency settings such as brightness."""
+
+import asyncio
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class LatestWinsThrottle(object):
+  """Sends at most one value per key at a time, dropping superseded values.
+
+  While a value is being sent for a key, only the latest value received for
+  that key is kept and sent once the former completes. Callers whose value is
+  superseded by a newer one return straight away.
+
+  Public Methods:
+    async_call: Sends a value for a key, unless superseded.
+  """
+
+  def __init__(self, send):
+    """Initializes the throttle.
+
+    Args:
+      send: Coroutine function sending a value, called with the value.
+    """
+    self._send = send
+    self._busy = set()
+    self._pending = {}
+    self._tasks = set()
+
+  async def async_call(self, key, value):
+    """Sends a value for a key, unless a newer one supersedes it.
+
+    Args:
+      key: Name of the setting the value is for.
+      value: Value to send.
+
+    Returns:
+      Whether the value was sent. False if it was superseded.
+    """
+    if key in self._busy:
+      previous = self._pending.get(key)
+      if previous is not None and not previous[1].done():
+        previous[1].set_result(False)
+      future = asyncio.get_running_loop().create_future()
+      self._pending[key] = (value, future)
+      return await future
+
+    self._busy.add(key)
+    try:
+      await self._send(value)
+    finally:
+      self._send_next(key)
+    return True
+
+  def _send_next(self, key):
+    """Starts sending the latest pending value of a key, if any.
+
+    Args:
+      key: Name of the setting whose value was just sent.
+    """
+    pending = self._pending.pop(key, None)
+    if pending is not None and pending[1].done():
+      # The caller was cancelled, so nobody is waiting for the value.
+      pending = None
+    if pending is None:
+      self._busy.discard(key)
+      return
+
+    task = asyncio.ensure_future(self._async_send_pending(key, *pending))
+    self._tasks.add(task)
+    task.add_done_callback(self._tasks.discard)
+
+  async def _async_send_pending(self, key, value, future):
+    """Sends a pending value and resolves the future of its caller.
+
+    Args:
+      key: Name of the setting the value is for.
+      value: Value to send.
+      future: Future awaited by the caller of the value.
+    """
+    _LOGGER.debug('Sending latest value for %s: %s.', key, value)
+    try:
+      await self._send(value)
+    except Exception as error:  # pylint: disable=broad-except
+      if not future.done():
+        future.set_exception(error)
+    else:
+      if not future.done():
+        future.set_result(True)
+    finally:
+      self._send_next(key)
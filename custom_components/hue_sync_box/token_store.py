@@ -0,0 +1,106 @@
+"""Stores the access tokens of all Sync Boxes."""
+
+import glob
+import json
+import logging
+import os
+
+from homeassistant.helpers import storage
+
+from . import const
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _read_legacy_token_files(directories):
+  """Reads the access tokens stored in legacy per-box token files.
+
+  Args:
+    directories: Directories where token files may have been written.
+
+  Returns:
+    Dictionary of access tokens keyed by box id.
+  """
+  tokens = {}
+  prefix = const.TOKEN_FILE.format('')
+  for directory in directories:
+    for token_file_path in glob.glob(os.path.join(directory, prefix + '*')):
+      box_id = os.path.basename(token_file_path)[len(prefix):]
+      try:
+        with open(token_file_path, 'r') as token_file:
+          token_data = json.loads(token_file.read()) or {}
+      except (OSError, ValueError) as error:
+        _LOGGER.warning(
+            'Unable to read token file %s: %s.', token_file_path, error)
+        continue
+      if token_data.get('access_token') and box_id not in tokens:
+        tokens[box_id] = token_data['access_token']
+  return tokens
+
+
+class TokenStore(object):
+  """In-memory access tokens of all Sync Boxes, persisted in storage.
+
+  Tokens are loaded once at start up and written atomically through Home
+  Assistant's storage helper, so reading them never touches the disk.
+
+  Public Methods:
+    async_load: Loads the tokens from storage.
+    async_set_token: Sets and persists the token of a box.
+    get_token: Gets the token of a box.
+  """
+
+  def __init__(self, hass):
+    """Initializes the store.
+
+    Args:
+      hass: Home Assistant instance.
+    """
+    self._hass = hass
+    self._store = storage.Store(
+        hass, const.TOKEN_STORAGE_VERSION, const.TOKEN_STORAGE_KEY)
+    self._tokens = {}
+
+  async def async_load(self):
+    """Loads the tokens from storage.
+
+    Tokens found in legacy token files, written by previous versions to the
+    configuration or working directory, are imported once.
+    """
+    data = await self._store.async_load()
+    if data is not None:
+      self._tokens = dict(data.get('tokens', {}))
+      return
+
+    self._tokens = await self._hass.async_add_executor_job(
+        _read_legacy_token_files, [self._hass.config.path(), os.getcwd()])
+    if self._tokens:
+      _LOGGER.info(
+          'Imported %s Hue Sync Box access token(s) from token files.',
+          len(self._tokens))
+    await self._async_save()
+
+  def get_token(self, box_id):
+    """Gets the access token of a box.
+
+    Args:
+      box_id: Id of the box.
+
+    Returns:
+      Access token. None if not found.
+    """
+    return self._tokens.get(box_id)
+
+  async def async_set_token(self, box_id, access_token):
+    """Sets and persists the access token of a box.
+
+    Args:
+      box_id: Id of the box.
+      access_token: Access token to store.
+    """
+    self._tokens[box_id] = access_token
+    await self._async_save()
+
+  async def _async_save(self):
+    """Persists the tokens."""
+    await self._store.async_save({'tokens': self._tokens})
@@ -0,0 +1,215 @@
+"""End-to-end latency and round-trip benchmark for the hue_sync_box component.
+
+Boots a Home Assistant instance with the custom component configured against
+a local Sync Box emulator, then calls each benchmarked service repeatedly. For
+every service it reports p50/p99 latency and the number of requests the box
+received per call, including the reconciling refresh. The script exits with a
+non-zero status if any service makes more requests than its budget allows.
+
+It is a manual check, to run before sending changes to the request paths. It
+requires a development environment with homeassistant and openssl installed,
+and takes a few seconds per iteration.
+
+Usage:
+  python scripts/benchmark.py --iterations 20 --latency 40 --jitter 10
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+from homeassistant import bootstrap
+from homeassistant import runner
+
+import sync_box_emulator
+
+_REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+_COMPONENT_DIR = os.path.join(_REPO_ROOT, 'custom_components', 'hue_sync_box')
+_ENTITY_ID = 'remote.benchmark_box'
+
+# Seconds to wait after each call for the debounced reconciling refresh.
+_SETTLE_TIME = 2.5
+
+_CONFIGURATION = """
+homeassistant:
+  name: Benchmark
+  latitude: 0
+  longitude: 0
+  elevation: 0
+  unit_system: metric
+  time_zone: UTC
+
+remote:
+  - platform: hue_sync_box
+    name: Benchmark Box
+    ip_address: 127.0.0.1:{port}
+"""
+
+
+class Scenario(object):
+  """Service call to benchmark.
+
+  Attributes:
+    name: Name of the scenario.
+    domain: Domain of the service.
+    service: Name of the service.
+    data: Service data, without the entity id.
+    initial_state: Execution state set on the emulator before each call.
+    request_budget: Maximum requests the box may receive per call.
+  """
+
+  def __init__(self, name, domain, service, data, initial_state,
+               request_budget):
+    self.name = name
+    self.domain = domain
+    self.service = service
+    self.data = data
+    self.initial_state = initial_state
+    self.request_budget = request_budget
+
+
+SCENARIOS = (
+    Scenario(
+        'toggle', 'remote', 'toggle', {},
+        {'mode': 'video', 'syncActive': True, 'hdmiActive': True}, 2),
+    Scenario(
+        'turn_on', 'remote', 'turn_on', {'activity': 'video'},
+        {'mode': 'powersave', 'syncActive': False, 'hdmiActive': False}, 2),
+    Scenario(
+        'set_area', 'hue_sync_box', 'set_area', {'area_name': 'TV Area'},
+        {'mode': 'video', 'syncActive': True, 'hdmiActive': True}, 2),
+    Scenario(
+        'set_intensity', 'hue_sync_box', 'set_intensity',
+        {'intensity': 'subtle'},
+        {'mode': 'video', 'syncActive': True, 'hdmiActive': True}, 2),
+)
+
+
+def _percentile(values, percent):
+  """Gets the nearest-rank percentile of a list of values.
+
+  Args:
+    values: Values to get the percentile of.
+    percent: Percentile to get, between 0 and 100.
+
+  Returns:
+    Percentile value.
+  """
+  ordered = sorted(values)
+  index = max(0, int(round(percent / 100 * len(ordered))) - 1)
+  return ordered[index]
+
+
+async def _async_start_home_assistant(config_dir, port):
+  """Boots Home Assistant with the component pointed at the emulator.
+
+  Args:
+    config_dir: Empty directory to use as Home Assistant configuration.
+    port: Port the emulator is listening on.
+
+  Returns:
+    Running Home Assistant instance.
+  """
+  custom_components_dir = os.path.join(config_dir, 'custom_components')
+  os.makedirs(custom_components_dir)
+  os.symlink(
+      _COMPONENT_DIR, os.path.join(custom_components_dir, 'hue_sync_box'))
+  with open(os.path.join(config_dir, 'configuration.yaml'), 'w') as config:
+    config.write(_CONFIGURATION.format(port=port))
+
+  hass = await bootstrap.async_setup_hass(
+      runner.RuntimeConfig(config_dir=config_dir, skip_pip=True))
+  if hass is None:
+    raise RuntimeError('Home Assistant failed to start.')
+  await hass.async_start()
+  await hass.async_block_till_done()
+  return hass
+
+
+async def _async_run_scenario(hass, emulator, scenario, iterations):
+  """Benchmarks one scenario.
+
+  Args:
+    hass: Running Home Assistant instance.
+    emulator: SyncBoxEmulator the component talks to.
+    scenario: Scenario to run.
+    iterations: Number of service calls to make.
+
+  Returns:
+    Tuple of the call latencies, in seconds, and requests made per call.
+  """
+  latencies = []
+  request_counts = []
+  for _ in range(iterations):
+    emulator.state['execution'].update(scenario.initial_state)
+    await hass.services.async_call(
+        'homeassistant', 'update_entity', {'entity_id': _ENTITY_ID},
+        blocking=True)
+    await asyncio.sleep(_SETTLE_TIME)
+    emulator.reset_stats()
+
+    start = time.perf_counter()
+    await hass.services.async_call(
+        scenario.domain, scenario.service,
+        {'entity_id': _ENTITY_ID, **scenario.data}, blocking=True)
+    latencies.append(time.perf_counter() - start)
+
+    await asyncio.sleep(_SETTLE_TIME)
+    request_counts.append(emulator.total_requests)
+  return latencies, request_counts
+
+
+async def async_main(args):
+  emulator = sync_box_emulator.SyncBoxEmulator(
+      latency=args.latency / 1000, jitter=args.jitter / 1000)
+  emulator_runner, port = await sync_box_emulator.async_start_emulator(
+      emulator)
+
+  failed = False
+  with tempfile.TemporaryDirectory(prefix='hue-sync-box-benchmark-') as tmp:
+    hass = await _async_start_home_assistant(tmp, port)
+    try:
+      print(f'{"service":<15}{"p50 ms":>10}{"p99 ms":>10}'
+            f'{"requests":>10}{"budget":>8}')
+      for scenario in SCENARIOS:
+        if args.only and scenario.name not in args.only:
+          continue
+        latencies, request_counts = await _async_run_scenario(
+            hass, emulator, scenario, args.iterations)
+        max_requests = max(request_counts)
+        print(f'{scenario.name:<15}'
+              f'{_percentile(latencies, 50) * 1000:>10.1f}'
+              f'{_percentile(latencies, 99) * 1000:>10.1f}'
+              f'{statistics.mean(request_counts):>10.2f}'
+              f'{scenario.request_budget:>8}')
+        if max_requests > scenario.request_budget:
+          failed = True
+          print(f'  FAIL: {scenario.name} made {max_requests} requests, '
+                f'budget is {scenario.request_budget}.')
+    finally:
+      await hass.async_stop()
+      await emulator_runner.cleanup()
+
+  return 1 if failed else 0
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('--iterations', type=int, default=10)
+  parser.add_argument(
+      '--latency', type=float, default=20,
+      help='Emulated Sync Box base latency in ms.')
+  parser.add_argument(
+      '--jitter', type=float, default=5,
+      help='Emulated Sync Box maximum jitter in ms.')
+  parser.add_argument(
+      '--only', nargs='*', help='Names of the scenarios to run.')
+  sys.exit(asyncio.run(async_main(parser.parse_args())))
+
+
+if __name__ == '__main__':
+  main()
@@ -0,0 +1,374 @@
+"""Local HTTPS stand-in for a Philips Hue Play HDMI Sync Box.
+
+Implements the subset of the Sync Box API used by the hue_sync_box custom
+component, keeping state between requests, with configurable latency, jitter
+and fault injection. Every request is counted so benchmarks can assert on the
+number of round trips made to the box.
+
+Usage:
+  python scripts/sync_box_emulator.py --port 8443 --latency 40 --jitter 10
+"""
+
+import argparse
+import asyncio
+import collections
+import copy
+import hashlib
+import json
+import logging
+import os
+import random
+import ssl
+import subprocess
+import tempfile
+
+from aiohttp import web
+
+_LOGGER = logging.getLogger(__name__)
+
+ACCESS_TOKEN = 'emulator-access-token'
+ACTIVE_SYNC_MODES = ('video', 'music', 'game')
+
+_INITIAL_STATE = {
+    'device': {
+        'name': 'Emulated Sync Box',
+        'deviceType': 'HSB1',
+        'uniqueId': 'C42996000000',
+        'apiLevel': 7,
+        'firmwareVersion': '1.12.0',
+        'lastCheckedUpdate': '2026-01-01T00:00:00Z',
+    },
+    'hue': {
+        'bridgeUniqueId': '001788FFFE000000',
+        'bridgeIpAddress': '192.168.1.2',
+        'groupId': '1',
+        'groups': {
+            '1': {
+                'name': 'Living Room',
+                'numLights': 4,
+                'active': False,
+            },
+            '2': {
+                'name': 'TV Area',
+                'numLights': 2,
+                'active': False,
+            },
+        },
+        'connectionState': 'connected',
+    },
+    'execution': {
+        'mode': 'passthrough',
+        'syncActive': False,
+        'hdmiActive': True,
+        'hdmiSource': 'input1',
+        'hueTarget': '1',
+        'brightness': 100,
+        'lastSyncMode': 'video',
+        'video': {
+            'intensity': 'high',
+            'backgroundLighting': False,
+        },
+        'game': {
+            'intensity': 'intense',
+            'backgroundLighting': False,
+        },
+        'music': {
+            'intensity': 'moderate',
+            'palette': 'happyEnergetic',
+        },
+    },
+    'hdmi': {
+        'input1': {
+            'name': 'Console',
+            'type': 'game',
+            'status': 'connected',
+            'lastSyncMode': 'game',
+        },
+        'input2': {
+            'name': 'Streaming',
+            'type': 'video',
+            'status': 'connected',
+            'lastSyncMode': 'video',
+        },
+        'input3': {
+            'name': 'HDMI 3',
+            'type': 'generic',
+            'status': 'unplugged',
+            'lastSyncMode': 'video',
+        },
+        'input4': {
+            'name': 'HDMI 4',
+            'type': 'generic',
+            'status': 'unplugged',
+            'lastSyncMode': 'video',
+        },
+        'output': {
+            'name': 'TV',
+            'type': 'video',
+            'status': 'connected',
+            'lastSyncMode': 'video',
+        },
+        'contentSpecs': '3840 x 2160 @ 60000 - HDR',
+        'videoSyncSupported': True,
+        'audioSyncSupported': True,
+    },
+    'behavior': {
+        'inactivePowersave': 20,
+        'cecPowersave': 1,
+        'usbPowersave': 1,
+        'hpdInputSwitch': 1,
+        'arcBypassMode': 0,
+    },
+}
+
+
+def _merge(target, update):
+  """Deep-merges update into target in place.
+
+  Args:
+    target: Dictionary to update.
+    update: Dictionary with the new values.
+  """
+  for key, value in update.items():
+    if isinstance(value, dict) and isinstance(target.get(key), dict):
+      _merge(target[key], value)
+    else:
+      target[key] = value
+
+
+class SyncBoxEmulator(object):
+  """Stateful emulation of the Sync Box API.
+
+  All settings can be changed while the emulator is running.
+
+  Attributes:
+    latency: Base delay, in seconds, added to every response.
+    jitter: Maximum random delay, in seconds, added on top of latency.
+    error_rate: Probability of answering a request with HTTP 500.
+    drop_rate: Probability of closing the connection without answering.
+    offline: Whether every request should be dropped.
+    auto_register: Whether registrations succeed without pressing the button.
+    etag: Whether GET responses carry an ETag and honor If-None-Match.
+    state: Current device details.
+    request_counts: Number of requests received, keyed by (method, path).
+  """
+
+  def __init__(
+          self, latency=0, jitter=0, error_rate=0, drop_rate=0,
+          auto_register=True, etag=False):
+    """Initializes the emulator.
+
+    Args:
+      latency: Base delay, in seconds, added to every response.
+      jitter: Maximum random delay, in seconds, added on top of latency.
+      error_rate: Probability of answering a request with HTTP 500.
+      drop_rate: Probability of closing the connection without answering.
+      auto_register: Whether registrations succeed without pressing the
+        button.
+      etag: Whether GET responses carry an ETag and honor If-None-Match.
+    """
+    self.latency = latency
+    self.jitter = jitter
+    self.error_rate = error_rate
+    self.drop_rate = drop_rate
+    self.offline = False
+    self.auto_register = auto_register
+    self.etag = etag
+    self.state = copy.deepcopy(_INITIAL_STATE)
+    self.request_counts = collections.Counter()
+
+  @property
+  def total_requests(self):
+    """Returns the number of requests received since the last reset."""
+    return sum(self.request_counts.values())
+
+  def reset_stats(self):
+    """Resets the request counters."""
+    self.request_counts.clear()
+
+  def reset_state(self):
+    """Resets the device details to their initial values."""
+    self.state = copy.deepcopy(_INITIAL_STATE)
+
+  def create_app(self):
+    """Creates the aiohttp application serving the API.
+
+    Returns:
+      aiohttp.web.Application.
+    """
+    app = web.Application(middlewares=[self._middleware])
+    app.router.add_post('/api/v1/registrations', self._handle_registrations)
+    app.router.add_get('/api/v1', self._handle_get_device_details)
+    app.router.add_put('/api/v1/execution', self._handle_put_execution)
+    app.router.add_get('/api/v1/{section}', self._handle_get_section)
+    return app
+
+  # Handlers.
+  @web.middleware
+  async def _middleware(self, request, handler):
+    """Counts requests and applies latency and fault injection."""
+    self.request_counts[(request.method, request.path)] += 1
+
+    delay = self.latency + random.uniform(0, self.jitter)
+    if delay:
+      await asyncio.sleep(delay)
+
+    if self.offline or random.random() < self.drop_rate:
+      request.transport.close()
+      raise web.HTTPServiceUnavailable()
+    if random.random() < self.error_rate:
+      raise web.HTTPInternalServerError()
+
+    if request.path != '/api/v1/registrations':
+      authorization = request.headers.get('Authorization')
+      if authorization != f'Bearer {ACCESS_TOKEN}':
+        return web.json_response(
+            {'code': 1, 'message': 'Unauthorized'}, status=401)
+
+    return await handler(request)
+
+  async def _handle_registrations(self, request):
+    """Registers an application, returning the access token."""
+    if not self.auto_register:
+      return web.json_response(
+          {'code': 16, 'message': 'Invalid State'}, status=400)
+    return web.json_response(
+        {'registrationId': '1', 'accessToken': ACCESS_TOKEN})
+
+  async def _handle_get_device_details(self, request):
+    """Returns the full device details."""
+    return self._json_response(request, self.state)
+
+  async def _handle_get_section(self, request):
+    """Returns one section of the device details."""
+    section = request.match_info['section']
+    if section not in self.state:
+      raise web.HTTPNotFound()
+    return self._json_response(request, self.state[section])
+
+  async def _handle_put_execution(self, request):
+    """Applies an execution payload to the device state."""
+    payload = json.loads(await request.read())
+    execution = self.state['execution']
+
+    hue_target = payload.get('hueTarget')
+    if hue_target is not None:
+      if hue_target not in self.state['hue']['groups']:
+        return web.json_response(
+            {'code': 7, 'message': 'Invalid hueTarget'}, status=400)
+      self.state['hue']['groupId'] = hue_target
+
+    _merge(execution, payload)
+
+    sync_mode = payload.get('mode')
+    if sync_mode is not None:
+      execution['syncActive'] = sync_mode in ACTIVE_SYNC_MODES
+      execution['hdmiActive'] = sync_mode != 'powersave'
+      if sync_mode in ACTIVE_SYNC_MODES:
+        execution['lastSyncMode'] = sync_mode
+
+    return web.Response(status=200)
+
+  def _json_response(self, request, body):
+    """Builds a JSON response, answering 304 if the client's ETag matches.
+
+    Args:
+      request: Request being answered.
+      body: JSON serializable response body.
+
+    Returns:
+      aiohttp.web.Response.
+    """
+    if not self.etag:
+      return web.json_response(body)
+    text = json.dumps(body)
+    etag = '"{}"'.format(hashlib.sha1(text.encode('utf-8')).hexdigest())
+    if request.headers.get('If-None-Match') == etag:
+      return web.Response(status=304, headers={'ETag': etag})
+    return web.Response(
+        text=text, content_type='application/json', headers={'ETag': etag})
+
+
+def create_ssl_context(certfile=None, keyfile=None):
+  """Creates the server TLS context, with a self-signed certificate if needed.
+
+  Args:
+    certfile: Path to the certificate. Generated with openssl if not given.
+    keyfile: Path to the private key. Generated with openssl if not given.
+
+  Returns:
+    ssl.SSLContext.
+  """
+  if not certfile:
+    directory = tempfile.mkdtemp(prefix='sync-box-emulator-')
+    certfile = os.path.join(directory, 'cert.pem')
+    keyfile = os.path.join(directory, 'key.pem')
+    subprocess.run(
+        ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes',
+         '-keyout', keyfile, '-out', certfile, '-days', '1',
+         '-subj', '/CN=localhost'],
+        check=True, capture_output=True)
+
+  ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+  ssl_context.load_cert_chain(certfile, keyfile)
+  return ssl_context
+
+
+async def async_start_emulator(emulator, host='127.0.0.1', port=0,
+                               ssl_context=None):
+  """Starts serving an emulator.
+
+  Args:
+    emulator: SyncBoxEmulator to serve.
+    host: Host to bind to.
+    port: Port to bind to. A free port is picked if 0.
+    ssl_context: Server TLS context. A self-signed one is created if None.
+
+  Returns:
+    Tuple of the aiohttp.web.AppRunner and the bound port.
+  """
+  runner = web.AppRunner(emulator.create_app(), access_log=None)
+  await runner.setup()
+  site = web.TCPSite(
+      runner, host, port, ssl_context=ssl_context or create_ssl_context())
+  await site.start()
+  bound_port = site._server.sockets[0].getsockname()[1]
+  return runner, bound_port
+
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+  parser.add_argument('--host', default='127.0.0.1')
+  parser.add_argument('--port', type=int, default=8443)
+  parser.add_argument(
+      '--latency', type=float, default=0, help='Base latency in ms.')
+  parser.add_argument(
+      '--jitter', type=float, default=0, help='Maximum jitter in ms.')
+  parser.add_argument(
+      '--error-rate', type=float, default=0,
+      help='Probability (0-1) of answering with HTTP 500.')
+  parser.add_argument(
+      '--drop-rate', type=float, default=0,
+      help='Probability (0-1) of dropping the connection.')
+  parser.add_argument(
+      '--require-button', action='store_true',
+      help='Reject registrations, as if the button was not pressed.')
+  parser.add_argument(
+      '--etag', action='store_true',
+      help='Send ETags and answer conditional requests with 304.')
+  parser.add_argument('--certfile')
+  parser.add_argument('--keyfile')
+  args = parser.parse_args()
+
+  logging.basicConfig(level=logging.INFO)
+  emulator = SyncBoxEmulator(
+      latency=args.latency / 1000, jitter=args.jitter / 1000,
+      error_rate=args.error_rate, drop_rate=args.drop_rate,
+      auto_register=not args.require_button, etag=args.etag)
+  web.run_app(
+      emulator.create_app(), host=args.host, port=args.port,
+      ssl_context=create_ssl_context(args.certfile, args.keyfile))
+
+
+if __name__ == '__main__':
+  main()